@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+GitHub Projects (v2) lookups shared by the nxs issue scripts.
+
+Projects are resolved through `repositoryOwner`, which covers both
+organizations and users in a single request. Title lookups page through
+the owner's projects with cursors and stop at the first exact match.
+
+Functions raise RuntimeError when the GitHub API can't be queried and
+return None when the project doesn't exist; callers decide how to report.
+"""
+
+import json
+import subprocess
+
+from repo_meta import get_repo_meta
+
+# Projects fetched per page when searching by title
+PROJECT_PAGE_SIZE = 50
+
+PROJECT_BY_NUMBER_QUERY = """
+query($owner: String!, $number: Int!) {
+    repositoryOwner(login: $owner) {
+        ... on ProjectV2Owner {
+            projectV2(number: $number) {
+                id
+                title
+            }
+        }
+    }
+}
+"""
+
+PROJECTS_BY_TITLE_QUERY = """
+query($owner: String!, $title: String!, $first: Int!, $cursor: String) {
+    repositoryOwner(login: $owner) {
+        ... on ProjectV2Owner {
+            projectsV2(first: $first, query: $title, after: $cursor) {
+                nodes {
+                    id
+                    title
+                }
+                pageInfo {
+                    hasNextPage
+                    endCursor
+                }
+            }
+        }
+    }
+}
+"""
+
+
+def run_graphql(query: str, fields: dict[str, str], typed_fields: dict[str, int] | None = None) -> dict:
+    """Run a GraphQL query through gh and return its "data".
+
+    Args:
+        fields: String variables (passed with -f)
+        typed_fields: Non-string variables (passed with -F)
+
+    Raises:
+        RuntimeError: If gh fails or the response can't be parsed.
+    """
+    cmd = ["gh", "api", "graphql", "-f", f"query={query}"]
+    for name, value in fields.items():
+        cmd.extend(["-f", f"{name}={value}"])
+    for name, value in (typed_fields or {}).items():
+        cmd.extend(["-F", f"{name}={value}"])
+
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        return json.loads(result.stdout).get("data") or {}
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(e.stderr.strip() or str(e)) from e
+    except json.JSONDecodeError as e:
+        raise RuntimeError(f"Invalid response from GitHub: {e}") from e
+
+
+def get_project_by_number(owner: str, number: int) -> dict | None:
+    """Return {"id", "title"} of an organization or user project by number."""
+    data = run_graphql(PROJECT_BY_NUMBER_QUERY, {"owner": owner}, {"number": number})
+    return (data.get("repositoryOwner") or {}).get("projectV2")
+
+
+def find_project_by_title(owner: str, title: str) -> dict | None:
+    """Return {"id", "title"} of the owner's project whose title matches exactly.
+
+    The comparison is case-insensitive; pages are fetched only until a
+    match is found.
+    """
+    wanted = title.lower()
+    fields = {"owner": owner, "title": title}
+    while True:
+        data = run_graphql(PROJECTS_BY_TITLE_QUERY, fields, {"first": PROJECT_PAGE_SIZE})
+        projects = (data.get("repositoryOwner") or {}).get("projectsV2") or {}
+        for node in projects.get("nodes") or []:
+            if node and (node.get("title") or "").lower() == wanted:
+                return node
+        page_info = projects.get("pageInfo") or {}
+        if not page_info.get("hasNextPage"):
+            return None
+        fields["cursor"] = page_info["endCursor"]
+
+
+def get_repo_owner() -> str:
+    """Return the login of the current repository's owner (from the repo metadata cache).
+
+    Raises:
+        RuntimeError: If the repository can't be resolved.
+    """
+    return get_repo_meta()["owner"]
+
+
+def find_project(project_name: str) -> dict | None:
+    """Resolve a project reference to {"id", "title"}.
+
+    The project_name can be in format:
+    - "owner/project-number" (e.g., "my-org/1")
+    - "owner/project-title"
+    - "project-number" or "project-title" (uses current repo's owner)
+
+    Returns:
+        The project, or None if it doesn't exist.
+    """
+    if "/" in project_name:
+        owner, project_ref = project_name.rsplit("/", 1)
+    else:
+        owner, project_ref = get_repo_owner(), project_name
+
+    try:
+        number = int(project_ref)
+    except ValueError:
+        return find_project_by_title(owner, project_ref)
+    return get_project_by_number(owner, number)
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Shared registry of the task labels documented in docs/system/delivery/task-labels.md.
+
+Task generation, issue creation and label preflight all validate against
+the same label set. The file is parsed once and the result cached in
+.tmp/label-registry.json, keyed by the file's path, mtime and size, so
+later runs only stat the file.
+
+Understands both heading entries such as
+    ## Backend (`backend`, #d876e3)
+    **Purpose:** API endpoints, server-side logic
+and table rows such as
+    | `backend` | API endpoints, server-side logic |
+
+Usage:
+    python label_registry.py [--project-root <path>] [--check <label> ...] [--no-cache]
+
+Output:
+    JSON export of the registry, or with --check the validation result for
+    each label (with suggestions for unknown ones); exits 1 if any is unknown.
+"""
+
+import argparse
+import difflib
+import json
+import os
+import re
+import sys
+import tempfile
+from pathlib import Path
+
+LABELS_PATH = Path("docs") / "system" / "delivery" / "task-labels.md"
+CACHE_PATH = Path(".tmp") / "label-registry.json"
+
+# Bump when the parsed format changes so stale caches are ignored
+CACHE_VERSION = 1
+
+HEADING_PATTERN = re.compile(
+    r"^#{2,}\s+(?P<title>.*?)\s*\(`(?P<name>[a-z][a-z0-9-]*)`(?:\s*,\s*#(?P<color>[0-9a-f]{6}))?\)",
+    re.IGNORECASE,
+)
+PURPOSE_PATTERN = re.compile(r"^\*\*Purpose:\*\*\s*(.+)$")
+TABLE_ROW_PATTERN = re.compile(r"^\|\s*`?([a-z][a-z0-9-]*)`?\s*\|([^|]*)", re.IGNORECASE)
+
+
+def parse_labels(content: str) -> dict[str, dict]:
+    """Parse label entries from task-labels.md content.
+
+    Returns:
+        Dict of lowercase label name to {"name", "title", "color", "description"},
+        where missing values are None.
+    """
+    labels: dict[str, dict] = {}
+    current: dict | None = None
+
+    for line in content.split("\n"):
+        match = HEADING_PATTERN.match(line)
+        if match:
+            name = match.group("name").lower()
+            color = match.group("color")
+            current = labels[name] = {
+                "name": name,
+                "title": match.group("title") or None,
+                "color": color.lower() if color else None,
+                "description": None,
+            }
+            continue
+        if line.startswith("#"):
+            current = None
+            continue
+
+        match = PURPOSE_PATTERN.match(line.strip())
+        if match and current is not None and current["description"] is None:
+            current["description"] = match.group(1).strip()
+            continue
+
+        match = TABLE_ROW_PATTERN.match(line)
+        if match:
+            name = match.group(1).lower()
+            # Skip header-like entries
+            if name in ("label", "name") or name in labels:
+                continue
+            labels[name] = {
+                "name": name,
+                "title": None,
+                "color": None,
+                "description": match.group(2).strip() or None,
+            }
+
+    return labels
+
+
+class LabelRegistry:
+    """The documented labels of a project, with case-insensitive lookup."""
+
+    def __init__(self, labels: dict[str, dict], source: Path, exists: bool):
+        self.labels = labels
+        self.source = source
+        self.exists = exists
+
+    @property
+    def names(self) -> set[str]:
+        return set(self.labels)
+
+    def __contains__(self, label: str) -> bool:
+        return label.lower() in self.labels
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def get(self, label: str) -> dict | None:
+        """Return the entry for a label, or None if it isn't documented."""
+        return self.labels.get(label.lower())
+
+    def color(self, label: str) -> str | None:
+        """Return the documented hex color of a label (without '#'), if any."""
+        entry = self.get(label)
+        return entry["color"] if entry else None
+
+    def suggest(self, label: str, limit: int = 3) -> list[str]:
+        """Return documented labels that look like a misspelling of label."""
+        return difflib.get_close_matches(label.lower(), sorted(self.labels), n=limit, cutoff=0.6)
+
+    def export(self) -> dict:
+        """Return a machine-readable view of the registry."""
+        return {
+            "source": str(self.source),
+            "exists": self.exists,
+            "labels": [self.labels[name] for name in sorted(self.labels)],
+        }
+
+
+def source_key(path: Path) -> dict | None:
+    """Return the cache key of the labels file, or None if it doesn't exist."""
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return {"version": CACHE_VERSION, "path": str(path), "mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+
+def read_cache(cache_path: Path, key: dict) -> dict[str, dict] | None:
+    """Return the cached labels if the cache was built from the same file state."""
+    try:
+        cached = json.loads(cache_path.read_text())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(cached, dict) or cached.get("key") != key:
+        return None
+    return cached.get("labels")
+
+
+def write_cache(cache_path: Path, key: dict, labels: dict[str, dict]) -> None:
+    """Store parsed labels atomically; the cache is an optimization, so failures are ignored."""
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_path.parent, prefix=f".{cache_path.name}.", suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump({"key": key, "labels": labels}, f)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+
+
+def load_label_registry(project_root: Path, use_cache: bool = True) -> LabelRegistry:
+    """Load the project's label registry, parsing task-labels.md only when it changed.
+
+    Returns:
+        The registry; exists is False (and it is empty) when task-labels.md
+        doesn't exist.
+    """
+    project_root = project_root.resolve()
+    labels_path = project_root / LABELS_PATH
+    key = source_key(labels_path)
+    if key is None:
+        return LabelRegistry({}, labels_path, exists=False)
+
+    cache_path = project_root / CACHE_PATH
+    labels = read_cache(cache_path, key) if use_cache else None
+    if labels is None:
+        labels = parse_labels(labels_path.read_text())
+        if use_cache:
+            write_cache(cache_path, key, labels)
+
+    return LabelRegistry(labels, labels_path, exists=True)
+
+
+def find_project_root(start_path: Path) -> Path:
+    """Find the project root by looking for CLAUDE.md or .git."""
+    current = start_path.resolve()
+
+    while current != current.parent:
+        if (current / "CLAUDE.md").exists() or (current / ".git").exists():
+            return current
+        current = current.parent
+
+    # Fallback to current working directory
+    return Path.cwd()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export or check the project's task labels")
+    parser.add_argument("--project-root", type=Path, help="Project root (auto-detected if not specified)")
+    parser.add_argument("--check", nargs="+", metavar="LABEL", help="Validate labels instead of exporting")
+    parser.add_argument("--no-cache", action="store_true", help="Parse task-labels.md without reading or writing the cache")
+    args = parser.parse_args()
+
+    project_root = args.project_root or find_project_root(Path.cwd())
+    registry = load_label_registry(project_root, use_cache=not args.no_cache)
+
+    if not args.check:
+        print(json.dumps(registry.export(), indent=2))
+        return
+
+    results = [
+        {"label": label, "valid": label in registry, "suggestions": [] if label in registry else registry.suggest(label)}
+        for label in args.check
+    ]
+    print(json.dumps(results, indent=2))
+    if not all(r["valid"] for r in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
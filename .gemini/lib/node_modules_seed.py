@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Seed a new worktree's node_modules from an existing checkout.
+
+When the lockfiles match, the source checkout's node_modules folders (the
+root one and those of workspace projects present in the destination) are
+cloned instead of installed: reflinks where the filesystem supports
+copy-on-write clones, hardlinks otherwise. pnpm's node_modules are already
+links into its store, so either is safe. If neither works (e.g. across
+filesystems), nothing is seeded and a regular install does the linking.
+
+Callers verify the result with `pnpm install --offline --frozen-lockfile`,
+which is a no-op when the seeded tree matches the lockfile.
+
+Usage:
+    python node_modules_seed.py <worktree-path> [--source <checkout>]
+
+Output:
+    JSON object with seeded folders, method (reflink, hardlink or null)
+    and the reason when nothing was seeded.
+"""
+
+import argparse
+import filecmp
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+from repo_meta import git_dirs
+
+LOCKFILE = "pnpm-lock.yaml"
+WORKSPACE_FILE = "pnpm-workspace.yaml"
+
+# `  - "apps/*"` entries of pnpm-workspace.yaml
+WORKSPACE_PACKAGE_PATTERN = re.compile(r"^\s*-\s*[\"']?([^\"'#\s]+)[\"']?\s*$")
+
+
+def workspace_patterns(root: Path) -> list[str]:
+    """Return the package globs listed in pnpm-workspace.yaml (exclusions skipped)."""
+    try:
+        lines = (root / WORKSPACE_FILE).read_text().splitlines()
+    except OSError:
+        return []
+    patterns = []
+    in_packages = False
+    for line in lines:
+        if not line.startswith((" ", "\t", "-")):
+            in_packages = line.strip().startswith("packages:")
+            continue
+        match = WORKSPACE_PACKAGE_PATTERN.match(line) if in_packages else None
+        if match and not match.group(1).startswith("!"):
+            patterns.append(match.group(1))
+    return patterns
+
+
+def node_modules_dirs(source: Path, destination: Path) -> list[Path]:
+    """Return the node_modules folders to seed, relative to the checkout root.
+
+    Workspace projects missing from the destination (e.g. outside a sparse
+    checkout) are skipped.
+    """
+    folders = [Path("node_modules")] if (source / "node_modules").is_dir() else []
+    for pattern in workspace_patterns(source):
+        for project in sorted(source.glob(pattern)):
+            relative = project.relative_to(source)
+            if (project / "node_modules").is_dir() and (destination / relative).is_dir():
+                folders.append(relative / "node_modules")
+    return folders
+
+
+def clone_tree(source: Path, destination: Path) -> str | None:
+    """Clone a directory tree with reflinks, falling back to hardlinks.
+
+    Returns:
+        "reflink", "hardlink", or None if neither is possible
+    """
+    reflink = ["cp", "-cR", str(source), str(destination)] if sys.platform == "darwin" else \
+        ["cp", "-a", "--reflink=always", str(source), str(destination)]
+    if shutil.which("cp") and subprocess.run(reflink, capture_output=True).returncode == 0:
+        return "reflink"
+    shutil.rmtree(destination, ignore_errors=True)
+
+    try:
+        shutil.copytree(source, destination, symlinks=True, copy_function=os.link)
+        return "hardlink"
+    except (OSError, shutil.Error):
+        shutil.rmtree(destination, ignore_errors=True)
+        return None
+
+
+def seed_node_modules(source: Path, destination: Path) -> dict:
+    """Seed destination's node_modules from source if their lockfiles match.
+
+    Folders that already exist in the destination are left alone.
+
+    Returns:
+        {"seeded": [relative folders], "method": str | None, "reason": str | None}
+    """
+    result = {"seeded": [], "method": None, "reason": None}
+    source_lock, destination_lock = source / LOCKFILE, destination / LOCKFILE
+    if source.resolve() == destination.resolve():
+        result["reason"] = "source and destination are the same checkout"
+    elif not source_lock.is_file() or not destination_lock.is_file():
+        result["reason"] = f"{LOCKFILE} missing"
+    elif not filecmp.cmp(source_lock, destination_lock, shallow=False):
+        result["reason"] = f"{LOCKFILE} differs"
+    if result["reason"]:
+        return result
+
+    for folder in node_modules_dirs(source, destination):
+        if (destination / folder).exists():
+            continue
+        method = clone_tree(source / folder, destination / folder)
+        if method is None:
+            result["reason"] = f"could not link {folder} (different filesystem?)"
+            break
+        result["seeded"].append(str(folder))
+        result["method"] = result["method"] or method
+
+    if not result["seeded"] and not result["reason"]:
+        result["reason"] = "nothing to seed"
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed a worktree's node_modules from another checkout")
+    parser.add_argument("worktree", type=Path, help="Worktree to seed")
+    parser.add_argument("--source", type=Path, help="Checkout to seed from (default: the main checkout)")
+    args = parser.parse_args()
+
+    try:
+        source = args.source or git_dirs(args.worktree)[1]
+    except RuntimeError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    print(json.dumps(seed_node_modules(source, args.worktree), indent=2))
+
+
+if __name__ == "__main__":
+    main()
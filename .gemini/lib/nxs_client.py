@@ -0,0 +1,146 @@
+"""
+Client side of the optional nxs daemon (see nxs_daemon.py).
+
+Kept to a handful of cheap imports because scripts call forward_to_daemon()
+before their own imports; when a daemon handles the call, the script's
+interpreter never loads anything else.
+"""
+
+import hashlib
+import json
+import os
+import socket
+import stat
+import struct
+import sys
+
+GEMINI_DIR = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+
+# Seconds a client waits to connect before running in-process
+CONNECT_TIMEOUT = 0.5
+
+# Environment variables sent with a call: the scripts' own settings. Everything
+# else (PATH, git and gh credentials, ...) comes from the daemon's environment,
+# which belongs to the same user.
+FORWARDED_ENV_PREFIX = "NXS_"
+
+
+class DaemonUnavailable(Exception):
+    """No trusted daemon accepted the connection; the caller can run in-process."""
+
+
+def runtime_dir() -> str:
+    """Return a directory only the current user can access, creating it if needed.
+
+    $XDG_RUNTIME_DIR/nxs when the session has one, else nxs-<uid> in the
+    temp directory. Either way it must be a real directory owned by this
+    user with no group or other permissions.
+
+    Raises:
+        DaemonUnavailable: If the directory fails those checks.
+    """
+    base = os.environ.get("XDG_RUNTIME_DIR")
+    path = os.path.join(base, "nxs") if base else os.path.join(os.environ.get("TMPDIR") or "/tmp", f"nxs-{os.getuid()}")
+    try:
+        os.mkdir(path, 0o700)
+    except FileExistsError:
+        pass
+    except OSError as e:
+        raise DaemonUnavailable(f"Cannot create {path}: {e}") from e
+
+    info = os.lstat(path)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+        raise DaemonUnavailable(f"{path} must be a directory owned by this user with mode 0700")
+    return path
+
+
+def socket_path() -> str:
+    """Return the daemon socket for this .gemini directory and user.
+
+    It lives in runtime_dir() rather than the checkout because Unix socket
+    paths are limited to ~100 characters, which a deep checkout can exceed.
+    """
+    digest = hashlib.sha1(GEMINI_DIR.encode()).hexdigest()[:12]
+    return os.path.join(runtime_dir(), f"{digest}.sock")
+
+
+def peer_uid(sock: socket.socket) -> int | None:
+    """Return the user ID of the process on the other end, where the platform reports it."""
+    if not hasattr(socket, "SO_PEERCRED"):
+        return None
+    _, uid, _ = struct.unpack("3i", sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i")))
+    return uid
+
+
+def call(method: str, params: dict | None = None, timeout: float | None = None) -> dict:
+    """Send one JSON-RPC request to the daemon and return its result.
+
+    Nothing is sent unless the socket, and where supported the process
+    listening on it, belong to the current user.
+
+    Raises:
+        DaemonUnavailable: If no trusted daemon is listening.
+        RuntimeError: If the request was sent but failed (connection lost or
+            an error response); it may already have had effects.
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        raise DaemonUnavailable("Unix sockets are not supported on this platform")
+    path = socket_path()
+    try:
+        info = os.lstat(path)
+    except FileNotFoundError:
+        raise DaemonUnavailable("daemon is not running") from None
+    if not stat.S_ISSOCK(info.st_mode) or info.st_uid != os.getuid():
+        raise DaemonUnavailable(f"{path} is not a socket owned by this user")
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(CONNECT_TIMEOUT)
+        try:
+            sock.connect(path)
+        except OSError as e:
+            raise DaemonUnavailable(str(e)) from e
+        if peer_uid(sock) not in (None, os.getuid()):
+            raise DaemonUnavailable(f"{path} is served by another user")
+        sock.settimeout(timeout)
+
+        request = {"jsonrpc": "2.0", "id": 1, "method": method, "params": params or {}}
+        try:
+            sock.sendall(json.dumps(request).encode() + b"\n")
+            with sock.makefile("rb") as reader:
+                line = reader.readline()
+        except OSError as e:
+            raise RuntimeError(f"Lost connection to nxs daemon: {e}") from e
+    finally:
+        sock.close()
+
+    try:
+        response = json.loads(line)
+    except ValueError as e:
+        raise RuntimeError("Invalid response from nxs daemon") from e
+    if "error" in response:
+        raise RuntimeError(f"nxs daemon error: {response['error'].get('message')}")
+    return response.get("result") or {}
+
+
+def forward_to_daemon(method: str) -> None:
+    """Hand this script invocation to a running daemon and exit with its result.
+
+    Returns without doing anything when no daemon is running (or
+    NXS_NO_DAEMON is set), so the script continues in-process.
+    """
+    if os.environ.get("NXS_NO_DAEMON"):
+        return
+    env = {name: value for name, value in os.environ.items() if name.startswith(FORWARDED_ENV_PREFIX)}
+    params = {"argv": sys.argv[1:], "cwd": os.getcwd(), "env": env}
+    try:
+        result = call(method, params)
+    except DaemonUnavailable:
+        return
+    except RuntimeError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    sys.stdout.write(result.get("stdout", ""))
+    sys.stderr.write(result.get("stderr", ""))
+    sys.exit(result.get("exit_code", 1))
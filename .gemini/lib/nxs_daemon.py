@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Optional long-lived workspace daemon for the nxs scripts.
+
+Agents run setup_workspace.py, ship_implementation.py, copy_dev_env.py and
+detect_env_patterns.py many times per session, each as a fresh interpreter
+that re-imports and re-discovers the repository. The daemon keeps those
+scripts imported, together with the in-process repo_meta memos, and serves
+them as JSON-RPC 2.0 methods (one JSON object per line) over a Unix socket
+that only the current user can access.
+
+Each script stays a complete CLI. Through nxs_client.forward_to_daemon(),
+called before its other imports, it first offers its arguments to a
+running daemon and prints the daemon's captured stdout
+and stderr with the same exit code; if no daemon is reachable it runs
+in-process as before. Calls are executed one at a time because they
+change the working directory, sys.argv and environment of the daemon.
+
+Usage:
+    python nxs_daemon.py start [--idle-timeout <seconds>]
+    python nxs_daemon.py stop
+    python nxs_daemon.py status
+    python nxs_daemon.py serve [--idle-timeout <seconds>]   # foreground
+
+Environment:
+    NXS_NO_DAEMON=1 makes every script run in-process.
+
+The socket lives in a directory only the user can access
+($XDG_RUNTIME_DIR/nxs or nxs-<uid> in the temp directory), and both sides
+check that the other end runs as the same user. Clients send only their
+NXS_* variables; scripts otherwise run with the daemon's environment.
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+import traceback
+from pathlib import Path
+
+from nxs_client import FORWARDED_ENV_PREFIX, GEMINI_DIR, DaemonUnavailable, call, peer_uid, socket_path
+
+# JSON-RPC method -> script, relative to the .gemini directory
+METHODS = {
+    "setup_workspace": Path("skills/nxs-workspace-setup/scripts/setup_workspace.py"),
+    "ship_implementation": Path("skills/nxs-ship/scripts/ship_implementation.py"),
+    "copy_dev_env": Path("skills/nxs-env-sync/scripts/copy_dev_env.py"),
+    "detect_env_patterns": Path("skills/nxs-env-sync/scripts/detect_env_patterns.py"),
+}
+
+# Seconds without calls before the daemon exits (override with NXS_DAEMON_IDLE_TIMEOUT)
+IDLE_TIMEOUT = int(os.environ.get("NXS_DAEMON_IDLE_TIMEOUT", 30 * 60))
+
+# JSON-RPC 2.0 error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+
+
+class ScriptRunner:
+    """Loads the scripts once and runs their main() with a captured environment."""
+
+    def __init__(self):
+        self.modules: dict[str, tuple[float, object]] = {}
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.last_call = time.time()
+
+    def load(self, method: str):
+        """Import a method's script, again only if the file changed."""
+        path = Path(GEMINI_DIR) / METHODS[method]
+        mtime = path.stat().st_mtime
+        cached = self.modules.get(method)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        spec = importlib.util.spec_from_file_location(f"nxs_daemon_{method}", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        self.modules[method] = (mtime, module)
+        return module
+
+    def run(self, method: str, argv: list[str], cwd: str, env: dict[str, str]) -> dict:
+        """Run a script's main() as if invoked from the client's shell.
+
+        The client's NXS_* variables replace the daemon's own; the rest of
+        the environment is the daemon's.
+        """
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with self.lock:
+            self.calls += 1
+            self.last_call = time.time()
+            saved_argv, saved_cwd, saved_env = sys.argv, os.getcwd(), dict(os.environ)
+            try:
+                for name in [name for name in os.environ if name.startswith(FORWARDED_ENV_PREFIX)]:
+                    del os.environ[name]
+                os.environ.update({k: v for k, v in env.items() if k.startswith(FORWARDED_ENV_PREFIX)})
+                with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+                    try:
+                        os.chdir(cwd)
+                        module = self.load(method)
+                        sys.argv = [module.__file__, *argv]
+                        module.main()
+                        exit_code = 0
+                    except SystemExit as e:
+                        if e.code is None or isinstance(e.code, int):
+                            exit_code = e.code or 0
+                        else:
+                            print(e.code, file=sys.stderr)
+                            exit_code = 1
+                    except Exception:
+                        traceback.print_exc()
+                        exit_code = 1
+            finally:
+                sys.argv = saved_argv
+                os.environ.clear()
+                os.environ.update(saved_env)
+                os.chdir(saved_cwd)
+                self.last_call = time.time()
+        return {"exit_code": exit_code, "stdout": stdout.getvalue(), "stderr": stderr.getvalue()}
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    """Handles newline-delimited JSON-RPC requests on one connection."""
+
+    def handle(self):
+        if peer_uid(self.connection) not in (None, os.getuid()):
+            return
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            response = self.server.dispatch(line)
+            self.wfile.write(json.dumps(response).encode() + b"\n")
+            self.wfile.flush()
+
+
+class DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path: str, idle_timeout: int):
+        self.path = path
+        self.idle_timeout = idle_timeout
+        self.runner = ScriptRunner()
+        self.started_at = time.time()
+        self.stopped = False
+        super().__init__(path, RequestHandler)
+
+    def dispatch(self, line: bytes) -> dict:
+        """Answer one JSON-RPC request."""
+        try:
+            request = json.loads(line)
+        except ValueError:
+            return rpc_error(None, PARSE_ERROR, "Parse error")
+        if not isinstance(request, dict) or not isinstance(request.get("method"), str):
+            return rpc_error(None, INVALID_REQUEST, "Invalid request")
+
+        request_id = request.get("id")
+        method = request["method"]
+        params = request.get("params") or {}
+
+        if method == "ping":
+            return rpc_result(request_id, self.status())
+        if method == "shutdown":
+            threading.Thread(target=self.stop, daemon=True).start()
+            return rpc_result(request_id, {"stopping": True})
+        if method not in METHODS:
+            return rpc_error(request_id, METHOD_NOT_FOUND, f"Method not found: {method}")
+        if not isinstance(params.get("argv"), list) or not isinstance(params.get("cwd"), str):
+            return rpc_error(request_id, INVALID_PARAMS, "params need argv (list) and cwd (string)")
+
+        env = params.get("env") if isinstance(params.get("env"), dict) else {}
+        return rpc_result(request_id, self.runner.run(method, params["argv"], params["cwd"], env))
+
+    def status(self) -> dict:
+        return {
+            "pid": os.getpid(),
+            "socket": self.path,
+            "gemini_dir": GEMINI_DIR,
+            "uptime": round(time.time() - self.started_at, 1),
+            "calls": self.runner.calls,
+            "loaded": sorted(self.runner.modules),
+            "methods": sorted(METHODS),
+        }
+
+    def stop(self):
+        """Remove the socket first, so new clients run in-process instead of waiting, then stop serving."""
+        self.stopped = True
+        Path(self.path).unlink(missing_ok=True)
+        self.shutdown()
+
+    def watch_idle(self):
+        """Shut the server down after idle_timeout seconds without calls."""
+        while True:
+            time.sleep(min(60, self.idle_timeout))
+            if not self.runner.lock.locked() and time.time() - self.runner.last_call > self.idle_timeout:
+                self.stop()
+                return
+
+
+def rpc_result(request_id, result: dict) -> dict:
+    return {"jsonrpc": "2.0", "id": request_id, "result": result}
+
+
+def rpc_error(request_id, code: int, message: str) -> dict:
+    return {"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}}
+
+
+def serve(idle_timeout: int) -> None:
+    """Run the daemon in the foreground until stopped or idle."""
+    path = Path(socket_path())
+    try:
+        call("ping")
+        print(f"nxs daemon already running on {path}", file=sys.stderr)
+        sys.exit(1)
+    except DaemonUnavailable:
+        path.unlink(missing_ok=True)  # Stale socket from a daemon that died
+
+    old_umask = os.umask(0o077)
+    try:
+        server = DaemonServer(str(path), idle_timeout)
+    finally:
+        os.umask(old_umask)
+
+    threading.Thread(target=server.watch_idle, daemon=True).start()
+    print(f"nxs daemon listening on {path} (pid {os.getpid()})", flush=True)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        # After stop() the path may already belong to a newly started daemon
+        if not server.stopped:
+            path.unlink(missing_ok=True)
+
+
+def start(idle_timeout: int) -> int:
+    """Start the daemon in the background and wait until it answers."""
+    try:
+        print(json.dumps(call("ping"), indent=2))
+        return 0
+    except DaemonUnavailable:
+        pass
+
+    log_path = Path(socket_path()).with_suffix(".log")
+    with open(log_path, "a") as log:
+        subprocess.Popen(
+            [sys.executable, str(Path(__file__).resolve()), "serve", "--idle-timeout", str(idle_timeout)],
+            stdin=subprocess.DEVNULL, stdout=log, stderr=log, start_new_session=True,
+        )
+    for _ in range(50):
+        time.sleep(0.1)
+        try:
+            print(json.dumps(call("ping"), indent=2))
+            return 0
+        except DaemonUnavailable:
+            continue
+    print(f"Error: nxs daemon did not start, see {log_path}", file=sys.stderr)
+    return 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Long-lived daemon serving the nxs workspace scripts")
+    parser.add_argument("command", choices=["start", "stop", "status", "serve"])
+    parser.add_argument("--idle-timeout", type=int, default=IDLE_TIMEOUT,
+                        help=f"Exit after this many seconds without calls (default: {IDLE_TIMEOUT})")
+    args = parser.parse_args()
+
+    try:
+        socket_path()
+    except DaemonUnavailable as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.command == "serve":
+        serve(args.idle_timeout)
+    elif args.command == "start":
+        sys.exit(start(args.idle_timeout))
+    else:
+        try:
+            print(json.dumps(call("ping" if args.command == "status" else "shutdown"), indent=2))
+        except DaemonUnavailable:
+            print("nxs daemon is not running", file=sys.stderr)
+            sys.exit(1)
+        except RuntimeError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Per-worktree port blocks, so dev servers and tests of several worktrees can
+run at the same time.
+
+Each worktree gets a block of PORT_BLOCK_SIZE consecutive ports, recorded
+in .tmp/worktree-ports.json of the main checkout and guarded by an flock on
+.tmp/worktree-ports.lock, so concurrent yolo workers never receive the
+same block. Blocks whose worktree no longer exists are reclaimed on the
+next allocation. A candidate block is skipped if any of its ports is in
+use on this machine.
+
+The ports reach the apps through the worktree's .env (loaded by Nx for
+every task), in a managed section:
+
+    PORT              apps/api (Fastify)
+    WEB_PORT          apps/web dev server (vite serve)
+    WEB_PREVIEW_PORT  apps/web preview server, used by apps/web-e2e
+    NXS_PORT_BLOCK    the whole block, e.g. 20010-20019, for anything else
+
+The main checkout keeps the apps' default ports.
+
+Usage:
+    python port_registry.py allocate <worktree> [--write-env]
+    python port_registry.py release <worktree>
+    python port_registry.py list
+
+Output:
+    JSON: the worktree's block ({"worktree", "start", "end", "env"}),
+    the released block (or null), or all blocks.
+"""
+
+import argparse
+import contextlib
+import fcntl
+import json
+import os
+import re
+import socket
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from repo_meta import git_dirs
+
+REGISTRY_PATH = Path(".tmp") / "worktree-ports.json"
+LOCK_PATH = Path(".tmp") / "worktree-ports.lock"
+
+# Ports handed out to worktrees (override the start with NXS_PORT_RANGE_START)
+DEFAULT_PORT_RANGE_START = 20000
+PORT_RANGE_SIZE = 10000
+PORT_BLOCK_SIZE = 10
+
+# .env variable -> offset in the block
+PORT_VARIABLES = {
+    "PORT": 0,
+    "WEB_PORT": 1,
+    "WEB_PREVIEW_PORT": 2,
+}
+BLOCK_VARIABLE = "NXS_PORT_BLOCK"
+
+ENV_BEGIN = "# >>> nxs ports (per-worktree, see .gemini/lib/port_registry.py)"
+ENV_END = "# <<< nxs ports"
+# Prefix for earlier assignments of the managed variables (e.g. copied from the main checkout)
+ENV_SHADOWED = "# shadowed by nxs ports: "
+
+# `KEY=...` or `export KEY=...`
+ENV_ASSIGNMENT_PATTERN = re.compile(r"^\s*(?:export\s+)?([A-Za-z_][A-Za-z0-9_]*)\s*=")
+
+
+@contextlib.contextmanager
+def locked_registry(main_root: Path):
+    """Yield the registry (worktree path -> block) under an exclusive lock, then save it."""
+    lock_path = main_root / LOCK_PATH
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        registry_path = main_root / REGISTRY_PATH
+        try:
+            registry = json.loads(registry_path.read_text())
+        except (OSError, ValueError):
+            registry = {}
+        if not isinstance(registry, dict):
+            registry = {}
+        before = json.dumps(registry, sort_keys=True)
+
+        yield registry
+
+        if json.dumps(registry, sort_keys=True) != before:
+            fd, tmp_path = tempfile.mkstemp(dir=registry_path.parent, prefix=f".{registry_path.name}.", suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump(registry, f, indent=2)
+            os.replace(tmp_path, registry_path)
+
+
+def port_range() -> range:
+    """Return the block starts to hand out, read per call so a long-running daemon follows each caller."""
+    start = int(os.environ.get("NXS_PORT_RANGE_START", DEFAULT_PORT_RANGE_START))
+    return range(start, start + PORT_RANGE_SIZE, PORT_BLOCK_SIZE)
+
+
+def port_free(port: int) -> bool:
+    """Return True if nothing listens on port (checked by binding it)."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        try:
+            sock.bind(("127.0.0.1", port))
+        except OSError:
+            return False
+    return True
+
+
+def describe(worktree: str, start: int) -> dict:
+    """Return the public view of a block: its range and the .env variables."""
+    env = {name: str(start + offset) for name, offset in PORT_VARIABLES.items()}
+    env[BLOCK_VARIABLE] = f"{start}-{start + PORT_BLOCK_SIZE - 1}"
+    return {"worktree": worktree, "start": start, "end": start + PORT_BLOCK_SIZE - 1, "env": env}
+
+
+def allocate_ports(worktree: Path) -> dict:
+    """Return the worktree's port block, allocating one if it has none.
+
+    Raises:
+        RuntimeError: If worktree is the main checkout or no block is free.
+    """
+    root, main_root = git_dirs(worktree)
+    if root == main_root:
+        raise RuntimeError("The main checkout uses the default ports; allocate blocks for worktrees only")
+    key = str(root)
+
+    with locked_registry(main_root) as registry:
+        for path in [path for path in registry if not Path(path).is_dir()]:
+            del registry[path]
+        if key in registry:
+            return describe(key, registry[key]["start"])
+
+        taken = {entry["start"] for entry in registry.values()}
+        starts = port_range()
+        for start in starts:
+            if start not in taken and all(port_free(port) for port in range(start, start + PORT_BLOCK_SIZE)):
+                registry[key] = {"start": start, "allocated_at": time.time()}
+                return describe(key, start)
+    raise RuntimeError(f"No free port block between {starts.start} and {starts.stop}")
+
+
+def release_ports(worktree: Path, main_root: Path | None = None) -> dict | None:
+    """Release the worktree's port block; the worktree itself may already be gone.
+
+    Args:
+        worktree: Worktree path
+        main_root: Main checkout root; required once the worktree is removed
+
+    Returns:
+        The released block, or None if the worktree had none
+    """
+    if main_root is None:
+        main_root = git_dirs(worktree)[1]
+    key = str(Path(worktree).resolve())
+    with locked_registry(main_root) as registry:
+        entry = registry.pop(key, None)
+    return describe(key, entry["start"]) if entry else None
+
+
+def list_ports(main_root: Path) -> list[dict]:
+    """Return all allocated blocks, ordered by port."""
+    with locked_registry(main_root) as registry:
+        entries = sorted(registry.items(), key=lambda item: item[1]["start"])
+    return [describe(path, entry["start"]) for path, entry in entries]
+
+
+def write_env_ports(worktree: Path, block: dict) -> Path:
+    """Write the block's variables into the worktree's .env.
+
+    The managed section is replaced in place (or appended). Earlier
+    assignments of the same variables are commented out rather than
+    deleted, so the values copied from the main checkout stay visible.
+
+    Returns:
+        Path to the .env file
+    """
+    env_path = Path(worktree) / ".env"
+    try:
+        lines = env_path.read_text().splitlines()
+    except FileNotFoundError:
+        lines = []
+
+    managed = set(block["env"])
+    kept = []
+    in_section = False
+    for line in lines:
+        if line == ENV_BEGIN:
+            in_section = True
+        elif line == ENV_END:
+            in_section = False
+        elif not in_section:
+            match = ENV_ASSIGNMENT_PATTERN.match(line)
+            kept.append(f"{ENV_SHADOWED}{line}" if match and match.group(1) in managed else line)
+
+    while kept and not kept[-1].strip():
+        kept.pop()
+    section = [ENV_BEGIN, *(f"{name}={value}" for name, value in block["env"].items()), ENV_END]
+    env_path.write_text("\n".join([*kept, *([""] if kept else []), *section]) + "\n")
+    return env_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Allocate and release per-worktree port blocks")
+    parser.add_argument("command", choices=["allocate", "release", "list"])
+    parser.add_argument("worktree", type=Path, nargs="?", default=Path.cwd(),
+                        help="Worktree path (default: current directory)")
+    parser.add_argument("--write-env", action="store_true", help="Also write the ports into the worktree's .env")
+    args = parser.parse_args()
+
+    try:
+        if args.command == "allocate":
+            result = allocate_ports(args.worktree)
+            if args.write_env:
+                write_env_ports(Path(result["worktree"]), result)
+        elif args.command == "release":
+            # A removed worktree is released through the repository of the current directory
+            result = release_ports(args.worktree, git_dirs(args.worktree if args.worktree.is_dir() else None)[1])
+        else:
+            result = list_ports(git_dirs(args.worktree)[1])
+    except (OSError, RuntimeError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Repository metadata shared by the nxs scripts, cached in .tmp/repo-meta.json.
+
+Owner, repository name, URL, default branch and the repository's default
+(first linked) project are fetched with a single GraphQL request and cached
+per remote URL for repo_meta_ttl() seconds. The cache lives in the main
+checkout, so every worktree of a yolo or planning run shares it.
+
+Usage:
+    python repo_meta.py [--refresh]
+
+Output:
+    JSON object with root, remote_url, owner, name, name_with_owner, url,
+    default_branch and project ({"id", "title"} or null).
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+CACHE_PATH = Path(".tmp") / "repo-meta.json"
+
+# Seconds before cached metadata is fetched again (override with NXS_REPO_META_TTL)
+DEFAULT_REPO_META_TTL = 24 * 60 * 60
+
+# owner/name from https://github.com/o/r(.git), git@github.com:o/r(.git) or ssh://git@github.com/o/r
+REMOTE_PATTERN = re.compile(r"[:/]([^/:]+)/([^/]+?)(?:\.git)?/?$")
+
+REPO_META_QUERY = """
+query($owner: String!, $name: String!) {
+    repository(owner: $owner, name: $name) {
+        name
+        nameWithOwner
+        url
+        owner { login }
+        defaultBranchRef { name }
+        projectsV2(first: 1) {
+            nodes {
+                id
+                title
+            }
+        }
+    }
+}
+"""
+
+# Per-process memos, keyed by working directory and by worktree root (with the time
+# it was stored, so long-lived processes such as nxs_daemon still honour the TTL)
+_git_dirs: dict[str, tuple[Path, Path]] = {}
+_repo_meta: dict[Path, tuple[float, dict]] = {}
+
+
+def _git(args: list[str], cwd: Path | None) -> str:
+    """Run a git command and return its stripped stdout. Raises RuntimeError on failure."""
+    try:
+        result = subprocess.run(["git", *args], capture_output=True, text=True, check=True, cwd=cwd)
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(f"git {' '.join(args)} failed: {e.stderr.strip()}") from e
+    return result.stdout.strip()
+
+
+def git_dirs(cwd: Path | None = None) -> tuple[Path, Path]:
+    """Return (worktree root, main checkout root) for cwd with one git call.
+
+    The main checkout root is the parent of the common .git directory, so it
+    is the same for every linked worktree.
+    """
+    base = Path(cwd or Path.cwd()).resolve()
+    key = str(base)
+    if key not in _git_dirs:
+        toplevel, common_dir = _git(["rev-parse", "--show-toplevel", "--git-common-dir"], base).splitlines()
+        common = Path(common_dir)
+        if not common.is_absolute():
+            common = (base / common).resolve()
+        root = Path(toplevel)
+        _git_dirs[key] = (root, common.parent if common.name == ".git" else root)
+    return _git_dirs[key]
+
+
+def get_repo_root(cwd: Path | None = None) -> Path:
+    """Return the root of the current worktree (git rev-parse --show-toplevel)."""
+    return git_dirs(cwd)[0]
+
+
+def parse_remote_url(remote_url: str) -> tuple[str, str] | None:
+    """Extract (owner, name) from a GitHub remote URL."""
+    match = REMOTE_PATTERN.search(remote_url)
+    return (match.group(1), match.group(2)) if match else None
+
+
+def fetch_repo_meta(owner: str, name: str) -> dict:
+    """Fetch repository metadata from GitHub in one request.
+
+    A missing project scope only drops the project, not the rest.
+
+    Raises:
+        RuntimeError: If the repository can't be fetched.
+    """
+    cmd = [
+        "gh", "api", "graphql",
+        "-f", f"query={REPO_META_QUERY}",
+        "-f", f"owner={owner}",
+        "-f", f"name={name}",
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    try:
+        repository = (json.loads(result.stdout).get("data") or {}).get("repository")
+    except json.JSONDecodeError:
+        repository = None
+    if not repository:
+        raise RuntimeError(f"Error fetching repository metadata: {result.stderr.strip() or 'repository not found'}")
+
+    projects = ((repository.get("projectsV2") or {}).get("nodes")) or []
+    return {
+        "owner": repository["owner"]["login"],
+        "name": repository["name"],
+        "name_with_owner": repository["nameWithOwner"],
+        "url": repository["url"],
+        "default_branch": (repository.get("defaultBranchRef") or {}).get("name"),
+        "project": projects[0] if projects and projects[0] else None,
+    }
+
+
+def fetch_repo_owner_and_name() -> tuple[str, str]:
+    """Ask gh for owner/name when the remote URL can't be parsed."""
+    cmd = ["gh", "repo", "view", "--json", "owner,name", "--jq", ".owner.login + \"/\" + .name"]
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(f"Error getting repository: {e.stderr.strip()}") from e
+    owner, _, name = result.stdout.strip().partition("/")
+    return owner, name
+
+
+def read_cache(cache_path: Path) -> dict:
+    """Return the cached entries keyed by remote URL (empty if missing or corrupt)."""
+    try:
+        cached = json.loads(cache_path.read_text())
+    except (OSError, ValueError):
+        return {}
+    return cached if isinstance(cached, dict) else {}
+
+
+def write_cache(cache_path: Path, cache: dict) -> None:
+    """Store the cache atomically; it is an optimization, so failures are ignored."""
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_path.parent, prefix=f".{cache_path.name}.", suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(cache, f, indent=2)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+
+
+def repo_meta_ttl() -> int:
+    """Return the cache lifetime, read per call so a long-running daemon follows each caller."""
+    return int(os.environ.get("NXS_REPO_META_TTL", DEFAULT_REPO_META_TTL))
+
+
+def get_repo_meta(cwd: Path | None = None, refresh: bool = False) -> dict:
+    """Return metadata for the repository containing cwd, from the cache when fresh.
+
+    Raises:
+        RuntimeError: If git or GitHub can't be queried and nothing is cached.
+    """
+    ttl = repo_meta_ttl()
+    root, main_root = git_dirs(cwd)
+    if root in _repo_meta and not refresh:
+        stored_at, meta = _repo_meta[root]
+        if time.time() - stored_at < ttl:
+            return meta
+
+    try:
+        remote_url = _git(["config", "--get", "remote.origin.url"], root)
+    except RuntimeError:
+        remote_url = ""
+
+    cache_path = main_root / CACHE_PATH
+    cache = read_cache(cache_path)
+    entry = cache.get(remote_url) if remote_url else None
+    if entry and not refresh and time.time() - entry.get("fetched_at", 0) < ttl:
+        meta = entry["meta"]
+    else:
+        owner_and_name = parse_remote_url(remote_url) if remote_url else None
+        try:
+            meta = fetch_repo_meta(*(owner_and_name or fetch_repo_owner_and_name()))
+        except RuntimeError:
+            if not entry:
+                raise
+            # Offline or rate limited: stale metadata beats none
+            meta = entry["meta"]
+        else:
+            if remote_url:
+                cache[remote_url] = {"fetched_at": time.time(), "meta": meta}
+                write_cache(cache_path, cache)
+
+    _repo_meta[root] = (time.time(), {"root": str(root), "remote_url": remote_url, **meta})
+    return _repo_meta[root][1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Print (cached) repository metadata as JSON")
+    parser.add_argument("--refresh", action="store_true", help="Ignore the cache and fetch from GitHub")
+    args = parser.parse_args()
+
+    try:
+        print(json.dumps(get_repo_meta(refresh=args.refresh), indent=2))
+    except RuntimeError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
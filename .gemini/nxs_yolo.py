@@ -17,6 +17,12 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
 
+sys.path.insert(0, str(Path(__file__).resolve().parent / "lib"))
+
+import repo_meta  # noqa: E402
+from node_modules_seed import seed_node_modules  # noqa: E402
+from port_registry import allocate_ports, release_ports, write_env_ports  # noqa: E402
+
 
 # Colors for terminal output
 class Colors:
@@ -82,8 +88,10 @@ def run_command(
 
 def get_repo_root() -> Path:
     """Get the git repository root."""
-    result = run_command(["git", "rev-parse", "--show-toplevel"])
-    return Path(result.stdout.strip())
+    try:
+        return repo_meta.get_repo_root()
+    except RuntimeError as e:
+        die(str(e))
 
 
 # ------------------------------------------------------------------------------
@@ -195,8 +203,9 @@ class StateManager:
 class WorkspaceManager:
     """Manages git worktrees and workspace setup."""
 
-    def __init__(self, repo_root: Path):
+    def __init__(self, repo_root: Path, sparse: bool = False):
         self.repo_root = repo_root
+        self.sparse = sparse
         self.setup_script = (
             repo_root
             / ".gemini"
@@ -225,6 +234,7 @@ class WorkspaceManager:
                 issue_body,
                 "--yolo-mode",
                 "true",
+                *(["--sparse"] if self.sparse else []),
             ],
             check=False,
         )
@@ -242,6 +252,8 @@ class WorkspaceManager:
             warn(f"Reusing existing worktree at {workspace_path}")
         elif action_taken == "created":
             success(f"Created worktree at {workspace_path} (branch: {workspace_branch})")
+            if workspace_result.get("sparse_paths"):
+                info(f"Sparse checkout: {', '.join(workspace_result['sparse_paths'])}")
         elif action_taken == "skipped":
             info(f"Already on feature branch {workspace_branch}, using current directory")
             workspace_result["workspace_path"] = str(Path.cwd())
@@ -276,6 +288,28 @@ class WorkspaceManager:
             return "pnpm"
         return "npm"
 
+    def _install_pnpm(self, worktree_path: Path) -> None:
+        """Install pnpm dependencies, seeding node_modules from the main checkout first.
+
+        With matching lockfiles the seeded tree only needs an offline,
+        frozen-lockfile check; otherwise (or if that check fails) a regular
+        install runs.
+        """
+        seed = seed_node_modules(repo_meta.git_dirs(self.repo_root)[1], worktree_path)
+        if seed["seeded"]:
+            info(f"Seeded {', '.join(seed['seeded'])} from the main checkout ({seed['method']})")
+            verify = run_command(
+                ["pnpm", "install", "--offline", "--frozen-lockfile", "--silent"],
+                cwd=worktree_path,
+                check=False,
+            )
+            if verify.returncode == 0:
+                return
+            warn("Seeded node_modules failed offline verification, running a full install")
+        elif seed["reason"]:
+            info(f"Not seeding node_modules: {seed['reason']}")
+        run_command(["pnpm", "install", "--silent"], cwd=worktree_path)
+
     def sync_environment(self, worktree_path: Path) -> None:
         """Sync environment in the worktree."""
         info(f"Syncing environment in {worktree_path}...")
@@ -293,7 +327,7 @@ class WorkspaceManager:
         if package_json.exists():
             pm = self._detect_package_manager(worktree_path)
             if pm == "pnpm":
-                run_command(["pnpm", "install", "--silent"], cwd=worktree_path)
+                self._install_pnpm(worktree_path)
             else:
                 run_command(["npm", "install", "--silent"], cwd=worktree_path)
             success(f"{pm} dependencies installed")
@@ -305,6 +339,14 @@ class WorkspaceManager:
             env_file.write_text(env_example.read_text())
             success("Created .env from .env.example")
 
+        # Give the worktree its own ports so parallel workers don't collide
+        try:
+            block = allocate_ports(worktree_path)
+            write_env_ports(worktree_path, block)
+            success(f"Ports {block['start']}-{block['end']} written to .env")
+        except (OSError, RuntimeError) as e:
+            warn(f"Could not allocate ports, using the defaults: {e}")
+
     def cleanup_worktree(self, worktree_path: Path, keep: bool = False) -> None:
         """Clean up the worktree."""
         if keep:
@@ -316,6 +358,10 @@ class WorkspaceManager:
             ["git", "worktree", "remove", str(worktree_path), "--force"],
             check=False,
         )
+        try:
+            release_ports(worktree_path, repo_meta.git_dirs(self.repo_root)[1])
+        except (OSError, RuntimeError) as e:
+            warn(f"Could not release ports: {e}")
         success("Worktree removed")
 
 
@@ -417,10 +463,10 @@ Implemented in commit `{commit_hash}` on branch `{branch_name}`.
 class YoloProcessor:
     """Main processor for YOLO mode."""
 
-    def __init__(self, repo_root: Path):
+    def __init__(self, repo_root: Path, sparse: bool = False):
         self.repo_root = repo_root
         self.state_manager = StateManager(repo_root)
-        self.workspace_manager = WorkspaceManager(repo_root)
+        self.workspace_manager = WorkspaceManager(repo_root, sparse=sparse)
         self.github_manager = GitHubManager()
 
     def process_issue(self, issue_number: int, is_resume: bool = False) -> None:
@@ -611,6 +657,11 @@ Note: Technical decisions and conflicts still require user input.
         action="store_true",
         help="Resume from last failed issue in a previous run",
     )
+    parser.add_argument(
+        "--sparse",
+        action="store_true",
+        help="Create sparse worktrees limited to the projects in the issue's Files section",
+    )
 
     return parser.parse_args()
 
@@ -623,7 +674,7 @@ def main() -> None:
     validate_environment()
 
     repo_root = get_repo_root()
-    processor = YoloProcessor(repo_root)
+    processor = YoloProcessor(repo_root, sparse=args.sparse)
 
     if args.resume:
         # Resume mode
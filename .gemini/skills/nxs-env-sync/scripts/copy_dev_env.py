@@ -1,9 +1,21 @@
 #!/usr/bin/env python3
-import argparse
-import shutil
+import os
 import sys
-from pathlib import Path
-from typing import List
+
+sys.path.insert(0, os.path.normpath(os.path.join(os.path.dirname(os.path.realpath(__file__)), "..", "..", "..", "lib")))
+
+from nxs_client import forward_to_daemon  # noqa: E402
+
+if __name__ == "__main__":
+    # Hand the call to a running nxs daemon before the heavier imports below
+    forward_to_daemon("copy_dev_env")
+
+import argparse  # noqa: E402
+import fnmatch  # noqa: E402
+import re  # noqa: E402
+import shutil  # noqa: E402
+from pathlib import Path  # noqa: E402
+from typing import List, Optional, Set  # noqa: E402
 
 # Default patterns to search for
 DEFAULT_PATTERNS = [
@@ -14,6 +26,71 @@ DEFAULT_PATTERNS = [
     "**/.env.*"     # .env.* in any subfolder
 ]
 
+# Dependency trees, VCS data and build caches: never searched through a wildcard,
+# only when a pattern names them (e.g. "dist/.env")
+PRUNED_DIRS = {
+    ".git", "node_modules", ".pnpm-store", ".nx", ".tmp", ".cache", ".turbo", ".next",
+    "dist", "build", "coverage", "test-output", ".venv", "venv", "__pycache__",
+}
+
+GLOB_MAGIC = re.compile(r"[*?[]")
+
+
+def split_pattern(pattern: str) -> List[str]:
+    """Split a glob pattern into path components."""
+    return [part for part in pattern.split("/") if part not in ("", ".")]
+
+
+def match_parts(path: List[str], pattern: List[str]) -> bool:
+    """Match path components against pattern components like Path.glob ("**" spans zero or more directories)."""
+    if not pattern:
+        return not path
+    if pattern[0] == "**":
+        return any(match_parts(path[i:], pattern[1:]) for i in range(len(path) + 1))
+    return bool(path) and fnmatch.fnmatchcase(path[0], pattern[0]) and match_parts(path[1:], pattern[1:])
+
+
+def reach(directory: List[str], pattern: List[str]) -> Optional[str]:
+    """Tell whether matches of pattern can lie below directory.
+
+    Returns:
+        "literal" if the pattern names every component of directory, "glob"
+        if it reaches it through wildcards, None if it can't match below it
+    """
+    literal = True
+    for i, part in enumerate(directory):
+        if pattern[i] == "**":
+            return "glob"
+        if i >= len(pattern) - 1 or not fnmatch.fnmatchcase(part, pattern[i]):
+            return None
+        literal = literal and not GLOB_MAGIC.search(pattern[i])
+    return "literal" if literal else "glob"
+
+
+def find_candidates(src_root: Path, patterns: List[str]) -> Set[Path]:
+    """Return the files below src_root matching any pattern, relative to src_root.
+
+    One pruned walk serves all patterns: directories no pattern can reach are
+    skipped, as are PRUNED_DIRS reached only through wildcards, which keeps
+    "**" patterns out of node_modules and build output.
+    """
+    compiled = [parts for parts in map(split_pattern, patterns) if parts]
+    candidates = set()
+    for dirpath, dirnames, filenames in os.walk(src_root):
+        directory = Path(dirpath).relative_to(src_root).parts
+        kept = []
+        for name in dirnames:
+            reached = {reach([*directory, name], parts) for parts in compiled}
+            if "literal" in reached or ("glob" in reached and name not in PRUNED_DIRS):
+                kept.append(name)
+        dirnames[:] = kept
+
+        for name in filenames:
+            path = [*directory, name]
+            if any(match_parts(path, parts) for parts in compiled) and os.path.isfile(os.path.join(dirpath, name)):
+                candidates.add(Path(*path))
+    return candidates
+
 
 def parse_arguments():
     parser = argparse.ArgumentParser(
@@ -78,16 +155,8 @@ def main():
     files_copied = 0
     files_skipped = 0
 
-    # We use a set to avoid duplicates if patterns overlap
-    files_to_process = set()
-
-    for pattern in patterns:
-        # glob is relative to the source root
-        for src_file in src_root.glob(pattern):
-            if src_file.is_file():
-                # Get path relative to the source root to maintain structure
-                rel_path = src_file.relative_to(src_root)
-                files_to_process.add(rel_path)
+    # Paths relative to the source root, to maintain structure (a set, as patterns overlap)
+    files_to_process = find_candidates(src_root, patterns)
 
     if not files_to_process:
         print("No matching files found in source.")
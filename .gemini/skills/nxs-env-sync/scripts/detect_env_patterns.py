@@ -1,7 +1,17 @@
 #!/usr/bin/env python3
 import os
-import json
-from pathlib import Path
+import sys
+
+sys.path.insert(0, os.path.normpath(os.path.join(os.path.dirname(os.path.realpath(__file__)), "..", "..", "..", "lib")))
+
+from nxs_client import forward_to_daemon  # noqa: E402
+
+if __name__ == "__main__":
+    # Hand the call to a running nxs daemon before the heavier imports below
+    forward_to_daemon("detect_env_patterns")
+
+import json  # noqa: E402
+from pathlib import Path  # noqa: E402
 
 
 def detect_tech_stack():
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for task template rendering.
+
+Compares the previous per-variable str.replace substitution with the
+compiled single-pass renderer over a synthetic epic.
+
+Usage:
+    python bench_template_render.py [--tasks 1000] [--repeat 5] [--project-root <path>]
+
+Output:
+    Best-of-N timings for rendering every task, one line per strategy.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from generate_task_files import (  # noqa: E402
+    build_task_variables,
+    compile_template,
+    find_project_root,
+    read_template,
+    render_template,
+)
+
+
+def replace_per_variable(template: str, variables: dict[str, str]) -> str:
+    """The previous substitute_template: one full-template pass per variable."""
+    result = template
+    for key, value in variables.items():
+        result = result.replace("{{" + key + "}}", value)
+    return result
+
+
+def make_tasks(count: int) -> list[dict]:
+    """Build synthetic tasks with realistic architect responses."""
+    architect_response = (
+        "### Files\n\n" + "".join(f"- `src/module_{i}.ts` - Component {i}\n" for i in range(12)) +
+        "\n### Interfaces/Types\n\n```typescript\n" +
+        "".join(f"export interface Model{i} {{ id: string; value: number }}\n" for i in range(20)) +
+        "```\n\n### Key Decisions\n\n| Decision | Rationale | Alternatives |\n| --- | --- | --- |\n" +
+        "".join(f"| Decision {i} | Because {i} | Other {i} |\n" for i in range(8)) +
+        "\n### Implementation Notes\n\n" + "Notes on patterns and edge cases. " * 60 +
+        "\n\n### Acceptance Criteria\n\n" + "".join(f"- [ ] Criterion {i}\n" for i in range(10))
+    )
+    return [
+        {
+            "sequence": seq,
+            "title": f"Task number {seq}",
+            "category": "Data Layer",
+            "summary": "Initialize state management for the layout. " * 5,
+            "effort": "S",
+            "labels": ["frontend", "state"],
+            "blocked_by": [seq - 1] if seq > 1 else [],
+            "blocks": [seq + 1] if seq < count else [],
+            "architect_response": architect_response,
+        }
+        for seq in range(1, count + 1)
+    ]
+
+
+def best_of(repeat: int, fn) -> float:
+    """Return the best wall-clock time of fn over repeat runs."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark task template rendering")
+    parser.add_argument("--tasks", type=int, default=1000, help="Number of tasks in the epic (default: 1000)")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per strategy, best is reported (default: 5)")
+    parser.add_argument("--project-root", type=Path, help="Project root (auto-detected if not specified)")
+    args = parser.parse_args()
+
+    project_root = args.project_root or find_project_root(Path.cwd())
+    template = read_template(project_root)
+    tasks = make_tasks(args.tasks)
+
+    # Variable building is identical for both strategies, so keep it out of the timing
+    all_variables = [build_task_variables(7, "Core Layout Shell", "enhancement", "repo", t)[0] for t in tasks]
+
+    def run_replace():
+        for variables in all_variables:
+            replace_per_variable(template, variables)
+
+    def run_compiled():
+        compiled = compile_template(template)
+        for variables in all_variables:
+            render_template(compiled, variables)
+
+    replace_time = best_of(args.repeat, run_replace)
+    compiled_time = best_of(args.repeat, run_compiled)
+
+    print(f"Template: {len(template)} chars, {len(all_variables[0])} variables, {args.tasks} tasks")
+    print(f"  str.replace per variable: {replace_time * 1000:8.2f} ms")
+    print(f"  compiled single pass:     {compiled_time * 1000:8.2f} ms ({replace_time / compiled_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,8 +7,9 @@ This script handles the deterministic parts of task file generation:
 - Reading the task template
 - Parsing architect responses to extract LLD sections
 - Computing derived variables (branch names, dependencies)
+- Validating the dependency graph (order, waves, critical path)
 - Substituting all template variables
-- Writing task files
+- Writing only the task files whose content changed
 
 Input JSON Schema:
 {
@@ -30,20 +31,44 @@ Input JSON Schema:
         }
     ]
 }
+
+JSONL input (--jsonl, or a .jsonl file): the first line is the epic metadata
+above without "tasks", followed by one task object per line. Tasks are
+rendered and written as they are read, so memory use doesn't grow with the
+size of the decomposition, and "-" reads the input from stdin.
 """
 
 import argparse
+import contextlib
+import glob
+import hashlib
+import io
 import json
 import os
 import re
 import sys
+import tempfile
+import time
 import urllib.request
 import urllib.error
+from concurrent.futures import ProcessPoolExecutor
+from email.utils import formatdate
+import heapq
 from pathlib import Path
+from typing import Iterable, Iterator, TextIO
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "lib"))
+
+from label_registry import LABELS_PATH, LabelRegistry, load_label_registry  # noqa: E402
+
 
+# Remote template URL for fallback download ({ref} is a branch ref, tag, or commit)
+TEMPLATE_PATH = Path("docs") / "system" / "delivery" / "task-template.md"
+TEMPLATE_URL_FORMAT = "https://raw.githubusercontent.com/sameera/nexus/{ref}/common/docs/system/delivery/task-template.md"
+TEMPLATE_URL = TEMPLATE_URL_FORMAT.format(ref="refs/heads/main")
 
-# Remote template URL for fallback download
-TEMPLATE_URL = "https://raw.githubusercontent.com/sameera/nexus/refs/heads/main/common/docs/system/delivery/task-template.md"
+# How long a cached (unpinned) template is used before it is revalidated
+TEMPLATE_CACHE_MAX_AGE = 24 * 60 * 60
 
 
 # Fallback content for when architect response is missing or incomplete
@@ -55,6 +80,26 @@ FALLBACKS = {
     "ACCEPTANCE_CRITERIA": "- [ ] Implements task summary requirements",
 }
 
+# Architect response ### headings, matched in one scan. Known LLD sections
+# are named groups; anything else is captured as OTHER. The pattern starts
+# with the literal "###" (no ^ anchor) so the regex engine can use a fast
+# prefix search; line starts (up to 3 spaces of indentation, as in Markdown)
+# are checked by the tokenizer. Lines may end in CRLF.
+SECTION_HEADER_PATTERN = re.compile(
+    r"###[ \t]+(?:"
+    r"(?P<FILES>Files(?:[ \t]+to[ \t]+Create/Modify)?)"
+    r"|(?P<INTERFACES>Interfaces(?:/Types)?)"
+    r"|(?P<KEY_DECISIONS>Key[ \t]+Decisions)"
+    r"|(?P<IMPLEMENTATION_NOTES>Implementation[ \t]+Notes)"
+    r"|(?P<ACCEPTANCE_CRITERIA>Acceptance[ \t]+Criteria)"
+    r"|(?P<OTHER>.*?)"
+    r")[ \t]*\r?$",
+    re.IGNORECASE | re.MULTILINE,
+)
+
+# Template placeholder: {{VARIABLE}}
+PLACEHOLDER_PATTERN = re.compile(r"\{\{(\w+)\}\}")
+
 # Effort size to human-readable estimate mapping
 EFFORT_MAP = {
     "XS": "< 4 hours",
@@ -64,6 +109,16 @@ EFFORT_MAP = {
     "XL": "3+ days (must be decomposed)",
 }
 
+# Working hours per effort size, the upper bound of each EFFORT_MAP estimate
+# (8-hour days), used to weight the critical path
+EFFORT_HOURS = {
+    "XS": 4,
+    "S": 8,
+    "M": 16,
+    "L": 24,
+    "XL": 32,
+}
+
 
 def to_kebab_case(text: str) -> str:
     """Convert text to kebab-case for branch names.
@@ -82,6 +137,57 @@ def to_kebab_case(text: str) -> str:
     return text.lower().strip("-")
 
 
+def tokenize_architect_sections(markdown: str) -> list[tuple[str | None, str, int, int, int]]:
+    """Split architect markdown into its ### sections in a single scan.
+
+    Every ### heading is returned, in order, including repeated and unknown
+    ones.
+
+    Returns:
+        List of (key, heading, start, content_start, end) tuples, where key
+        is the LLD section key (e.g., "FILES") or None for unknown headings,
+        and content spans markdown[content_start:end].
+    """
+    headings = []
+    for match in SECTION_HEADER_PATTERN.finditer(markdown):
+        line_start = markdown.rfind("\n", 0, match.start()) + 1
+        indent = match.start() - line_start
+        if indent <= 3 and markdown[line_start:match.start()] == " " * indent:
+            headings.append((line_start, match))
+
+    sections = []
+    for i, (start, match) in enumerate(headings):
+        key = match.lastgroup if match.lastgroup != "OTHER" else None
+        end = headings[i + 1][0] if i + 1 < len(headings) else len(markdown)
+        # Content starts on the line after the heading
+        content_start = min(match.end() + 1, end)
+        sections.append((key, match.group(0)[3:].strip(), start, content_start, end))
+    return sections
+
+
+def extract_code_block(content: str) -> str | None:
+    """Return the body of the first ``` code block (typescript/ts tag optional).
+
+    Returns None if there is no complete code block.
+    """
+    start = content.find("```")
+    if start == -1:
+        return None
+
+    body_start = start + 3
+    for tag in ("typescript", "ts"):
+        if content.startswith(tag, body_start):
+            body_start += len(tag)
+            break
+    if content.startswith("\n", body_start):
+        body_start += 1
+
+    end = content.find("```", body_start)
+    if end == -1:
+        return None
+    return content[body_start:end]
+
+
 def parse_architect_response(markdown: str | None) -> dict[str, str]:
     """Extract LLD sections from architect markdown response.
 
@@ -92,49 +198,36 @@ def parse_architect_response(markdown: str | None) -> dict[str, str]:
     - ### Implementation Notes
     - ### Acceptance Criteria
 
+    Unknown ### sections are passed through as part of the preceding known
+    section. Repeated sections are joined in order.
+
     Returns dict with keys: FILES, INTERFACES, KEY_DECISIONS,
     IMPLEMENTATION_NOTES, ACCEPTANCE_CRITERIA
     """
     if not markdown:
         return {}
 
-    result: dict[str, str] = {}
-
-    # Define section header patterns and their output keys
-    section_patterns = [
-        (r"###\s+Files(?:\s+to\s+Create/Modify)?\s*\n", "FILES"),
-        (r"###\s+Interfaces(?:/Types)?\s*\n", "INTERFACES"),
-        (r"###\s+Key\s+Decisions\s*\n", "KEY_DECISIONS"),
-        (r"###\s+Implementation\s+Notes\s*\n", "IMPLEMENTATION_NOTES"),
-        (r"###\s+Acceptance\s+Criteria\s*\n", "ACCEPTANCE_CRITERIA"),
-    ]
-
-    # Find all section positions
-    sections: list[tuple[int, int, str]] = []  # (start, header_end, key)
+    parts: dict[str, list[str]] = {}
+    current: list[str] | None = None
 
-    for pattern, key in section_patterns:
-        match = re.search(pattern, markdown, re.IGNORECASE)
-        if match:
-            sections.append((match.start(), match.end(), key))
+    for key, _, start, content_start, end in tokenize_architect_sections(markdown):
+        if key is None:
+            # Keep unknown sections (heading included) with the section they follow
+            if current is not None:
+                current.append(markdown[start:end])
+            continue
+        current = [markdown[content_start:end]]
+        parts.setdefault(key, []).append(current)
 
-    # Sort by position
-    sections.sort(key=lambda x: x[0])
-
-    # Extract content between sections
-    for i, (start, header_end, key) in enumerate(sections):
-        # Find the end of this section (start of next section or end of string)
-        if i + 1 < len(sections):
-            end = sections[i + 1][0]
-        else:
-            end = len(markdown)
-
-        content = markdown[header_end:end].strip()
+    result: dict[str, str] = {}
+    for key, occurrences in parts.items():
+        content = "\n\n".join("".join(chunks).strip() for chunks in occurrences).strip()
 
         # For INTERFACES, try to extract just the code block content
-        if key == "INTERFACES" and "```" in content:
-            code_match = re.search(r"```(?:typescript|ts)?\n?(.*?)```", content, re.DOTALL)
-            if code_match:
-                content = code_match.group(1).strip()
+        if key == "INTERFACES":
+            code = extract_code_block(content)
+            if code is not None:
+                content = code.strip()
 
         if content:
             result[key] = content
@@ -156,65 +249,181 @@ def format_dependencies(deps: list[int], epic_number: int) -> str:
     return ", ".join(formatted)
 
 
-def compute_branch_name(epic_type: str, epic_number: int, epic_title: str) -> str:
-    """Generate git branch name.
+def dependency_fields(task: dict) -> dict:
+    """Keep only the fields analyze_dependencies needs, so streamed tasks can be dropped."""
+    return {
+        "sequence": task["sequence"],
+        "blocked_by": list(task.get("blocked_by", [])),
+        "blocks": list(task.get("blocks", [])),
+        "effort": task.get("effort", "M"),
+    }
 
-    Examples:
-        ("enhancement", 7, "Core Layout Shell") -> "feat/7-core-layout-shell"
-        ("bug", 42, "Fix Login Issue") -> "bug/42-fix-login-issue"
+
+def find_cycle(remaining: set[int], predecessors: dict[int, set[int]]) -> list[int]:
+    """Return one dependency cycle among tasks left over by a topological sort.
+
+    Every remaining task has a remaining predecessor, so walking predecessors
+    from any of them must revisit a task.
     """
-    prefix = "bug" if epic_type.lower() == "bug" else "feat"
-    kebab_title = to_kebab_case(epic_title)
-    return f"{prefix}/{epic_number}-{kebab_title}"
+    path: list[int] = []
+    seen: dict[int, int] = {}
+    node = min(remaining)
+    while node not in seen:
+        seen[node] = len(path)
+        path.append(node)
+        node = min(predecessors[node] & remaining)
+    cycle = path[seen[node]:]
+    cycle.reverse()
+    return cycle
 
 
-def parse_valid_labels(project_root: Path) -> set[str] | None:
-    """Parse valid labels from task-labels.md file.
+def analyze_dependencies(tasks: list[dict], epic_number: int) -> dict:
+    """Validate the task dependency graph and compute its schedule.
 
-    Looks for a markdown table with label names in the first column.
-    Returns None if the file doesn't exist (validation skipped).
-    Returns empty set if file exists but no labels found.
-    """
-    labels_path = project_root / "docs" / "system" / "delivery" / "task-labels.md"
+    Edges come from both blocked_by and blocks. Unknown or self references,
+    duplicate sequences and cycles are errors; a blocks entry that isn't
+    mirrored by a blocked_by (or vice versa) is a warning.
 
-    if not labels_path.exists():
-        return None
+    Returns:
+        Dict with valid, errors, warnings, order (topological, by sequence
+        within a level), waves (sequences runnable in parallel per level),
+        max_parallel, critical_path and critical_path_hours. The schedule
+        fields are empty when the graph has errors.
+    """
+    def task_id(seq: int) -> str:
+        return f"TASK-{epic_number}.{seq:02d}"
 
-    content = labels_path.read_text()
-    labels: set[str] = set()
+    errors: list[str] = []
+    warnings: list[str] = []
+    by_seq: dict[int, dict] = {}
+    for task in tasks:
+        seq = task["sequence"]
+        if seq in by_seq:
+            errors.append(f"Duplicate sequence {task_id(seq)}")
+        by_seq[seq] = task
+
+    predecessors: dict[int, set[int]] = {seq: set() for seq in by_seq}
+    for seq, task in by_seq.items():
+        for dep in task["blocked_by"]:
+            if dep == seq:
+                errors.append(f"{task_id(seq)} is blocked by itself")
+            elif dep not in by_seq:
+                errors.append(f"{task_id(seq)} is blocked by unknown task {task_id(dep)}")
+            else:
+                predecessors[seq].add(dep)
+                if seq not in by_seq[dep]["blocks"]:
+                    warnings.append(f"{task_id(seq)} is blocked by {task_id(dep)}, which doesn't list it in blocks")
+        for dependent in task["blocks"]:
+            if dependent == seq:
+                errors.append(f"{task_id(seq)} blocks itself")
+            elif dependent not in by_seq:
+                errors.append(f"{task_id(seq)} blocks unknown task {task_id(dependent)}")
+            else:
+                predecessors[dependent].add(seq)
+                if seq not in by_seq[dependent]["blocked_by"]:
+                    warnings.append(f"{task_id(seq)} blocks {task_id(dependent)}, which doesn't list it in blocked_by")
+
+    # Kahn's algorithm, taking the lowest ready sequence first for a stable order
+    successors: dict[int, list[int]] = {seq: [] for seq in by_seq}
+    for seq, preds in predecessors.items():
+        for pred in preds:
+            successors[pred].append(seq)
+    pending = {seq: len(preds) for seq, preds in predecessors.items()}
+    ready = [seq for seq, count in pending.items() if count == 0]
+    heapq.heapify(ready)
+    order: list[int] = []
+    while ready:
+        seq = heapq.heappop(ready)
+        order.append(seq)
+        for dependent in successors[seq]:
+            pending[dependent] -= 1
+            if pending[dependent] == 0:
+                heapq.heappush(ready, dependent)
+
+    if len(order) < len(by_seq):
+        cycle = find_cycle(set(by_seq) - set(order), predecessors)
+        errors.append("Dependency cycle: " + " -> ".join(task_id(seq) for seq in cycle + cycle[:1]))
+
+    analysis: dict = {
+        "valid": not errors,
+        "errors": errors,
+        "warnings": warnings,
+        "order": [],
+        "waves": [],
+        "max_parallel": 0,
+        "critical_path": [],
+        "critical_path_hours": 0,
+    }
+    if errors:
+        return analysis
+
+    # Wave = 1 + deepest predecessor wave; critical path = heaviest chain by effort
+    wave: dict[int, int] = {}
+    hours: dict[int, int] = {}
+    via: dict[int, int | None] = {}
+    for seq in order:
+        preds = predecessors[seq]
+        wave[seq] = 1 + max((wave[p] for p in preds), default=0)
+        heaviest = max(preds, key=lambda p: (hours[p], -p), default=None)
+        via[seq] = heaviest
+        effort = by_seq[seq]["effort"]
+        hours[seq] = EFFORT_HOURS.get(effort, EFFORT_HOURS["M"]) + (hours[heaviest] if heaviest is not None else 0)
+
+    waves: list[list[int]] = [[] for _ in range(max(wave.values(), default=0))]
+    for seq in order:
+        waves[wave[seq] - 1].append(seq)
+    for level in waves:
+        level.sort()
+
+    path: list[int] = []
+    end = max(order, key=lambda s: (hours[s], -s), default=None)
+    while end is not None:
+        path.append(end)
+        end = via[end]
+    path.reverse()
+
+    analysis.update({
+        "order": order,
+        "waves": waves,
+        "max_parallel": max((len(level) for level in waves), default=0),
+        "critical_path": path,
+        "critical_path_hours": hours[path[-1]] if path else 0,
+    })
+    return analysis
 
-    # Look for table rows: | label-name | description |
-    # Skip header row and separator row (|---|---|)
-    table_row_pattern = r"^\|\s*`?([a-z][a-z0-9-]*)`?\s*\|"
 
-    for line in content.split("\n"):
-        match = re.match(table_row_pattern, line, re.IGNORECASE)
-        if match:
-            label = match.group(1).lower().strip("`")
-            # Skip header-like entries
-            if label not in ("label", "name", "---", "-"):
-                labels.add(label)
+def compute_branch_name(epic_type: str, epic_number: int, epic_title: str) -> str:
+    """Generate git branch name.
 
-    return labels
+    Examples:
+        ("enhancement", 7, "Core Layout Shell") -> "feat/7-core-layout-shell"
+        ("bug", 42, "Fix Login Issue") -> "bug/42-fix-login-issue"
+    """
+    prefix = "bug" if epic_type.lower() == "bug" else "feat"
+    kebab_title = to_kebab_case(epic_title)
+    return f"{prefix}/{epic_number}-{kebab_title}"
 
 
 def validate_labels(
     task_labels: list[str],
-    valid_labels: set[str] | None,
+    registry: LabelRegistry,
     task_id: str,
 ) -> list[str]:
-    """Validate task labels against known valid labels.
+    """Validate task labels against the project's label registry.
 
-    Returns list of warning messages for invalid labels.
-    If valid_labels is None, validation is skipped (no warnings).
+    Returns list of warning messages for invalid labels, with suggestions
+    for likely misspellings. If task-labels.md doesn't exist, validation is
+    skipped (no warnings).
     """
-    if valid_labels is None:
+    if not registry.exists:
         return []
 
     warnings: list[str] = []
     for label in task_labels:
-        if label.lower() not in valid_labels:
-            warnings.append(f"[WARN] {task_id}: Unknown label '{label}' (not in task-labels.md)")
+        if label not in registry:
+            suggestions = registry.suggest(label)
+            hint = f", did you mean {' or '.join(repr(s) for s in suggestions)}?" if suggestions else ""
+            warnings.append(f"[WARN] {task_id}: Unknown label '{label}' (not in task-labels.md{hint})")
 
     return warnings
 
@@ -229,13 +438,36 @@ def compute_workspace_path(epic_number: int, repo_name: str) -> str:
     return f"../{repo_name}-worktrees/{epic_number}"
 
 
+def compile_template(template: str) -> list[str]:
+    """Compile a template into alternating literal and placeholder segments.
+
+    Even indices hold literal text, odd indices hold placeholder names:
+        "a {{X}} b" -> ["a ", "X", " b"]
+    """
+    return PLACEHOLDER_PATTERN.split(template)
+
+
+def template_placeholders(compiled: list[str]) -> set[str]:
+    """Return the placeholder names used by a compiled template."""
+    return set(compiled[1::2])
+
+
+def render_template(compiled: list[str], variables: dict[str, str]) -> str:
+    """Render a compiled template in a single pass.
+
+    Placeholders without a value are left in place as {{NAME}}. Values are
+    inserted verbatim, so placeholders inside values are never expanded.
+    """
+    parts = compiled.copy()
+    for i in range(1, len(parts), 2):
+        name = parts[i]
+        parts[i] = variables.get(name, "{{" + name + "}}")
+    return "".join(parts)
+
+
 def substitute_template(template: str, variables: dict[str, str]) -> str:
     """Replace all {{VARIABLE}} placeholders in template."""
-    result = template
-    for key, value in variables.items():
-        placeholder = "{{" + key + "}}"
-        result = result.replace(placeholder, value)
-    return result
+    return render_template(compile_template(template), variables)
 
 
 def strip_template_comment(template: str) -> str:
@@ -249,60 +481,201 @@ def strip_template_comment(template: str) -> str:
     return re.sub(pattern, "", template)
 
 
-def download_template(template_path: Path) -> str:
-    """Download the task template from GitHub and save locally.
+def get_template_url(version: str | None = None) -> str:
+    """Get the remote template URL, optionally pinned to a tag or commit."""
+    if version:
+        return TEMPLATE_URL_FORMAT.format(ref=version)
+    return TEMPLATE_URL
 
-    Returns the template content on success.
-    Raises an exception if download fails.
+
+def get_template_cache_dir() -> Path:
+    """Get the shared user cache directory for downloaded templates.
+
+    Uses $NXS_CACHE_DIR if set, otherwise $XDG_CACHE_HOME/nxs (or ~/.cache/nxs).
+    The cache is shared by every checkout and worktree of every project.
     """
-    print(f"Template not found locally. Downloading from GitHub...", file=sys.stderr)
+    if os.environ.get("NXS_CACHE_DIR"):
+        base = Path(os.environ["NXS_CACHE_DIR"])
+    else:
+        base = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "nxs"
+    return base / "templates"
+
 
+def file_mode(path: Path) -> int:
+    """Return the permission bits for writing path: its current ones, or the umask default."""
     try:
-        with urllib.request.urlopen(TEMPLATE_URL, timeout=30) as response:
-            content = response.read().decode("utf-8")
+        return path.stat().st_mode & 0o7777
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+def write_file_atomic(path: Path, content: str) -> None:
+    """Write a file via a temp file and rename, so readers never see a partial file.
+
+    The file keeps its permissions (mkstemp creates 0600 temp files).
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    mode = file_mode(path)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        os.fchmod(fd, mode)
+        with os.fdopen(fd, "w") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+
+
+def content_digest(data: bytes) -> str:
+    """Return the sha256 hex digest used to compare rendered and on-disk content."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def file_state(path: Path) -> tuple[int, int] | None:
+    """Return (mtime_ns, size) of a file, or None if it doesn't exist."""
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def classify_task_file(path: Path, content: str) -> str:
+    """Compare rendered content with the existing file.
+
+    Returns:
+        "created" if the file doesn't exist, "unchanged" if its content hashes
+        equal, otherwise "updated".
+    """
+    try:
+        existing = path.read_bytes()
+    except FileNotFoundError:
+        return "created"
+    if content_digest(existing) == content_digest(content.encode()):
+        return "unchanged"
+    return "updated"
 
-        # Ensure parent directory exists
-        template_path.parent.mkdir(parents=True, exist_ok=True)
 
-        # Save for future use
-        template_path.write_text(content)
-        print(f"Template saved to: {template_path}", file=sys.stderr)
+def download_template(url: str, offline: bool = False, immutable: bool = False) -> str:
+    """Get a template from the shared cache, downloading it if needed.
 
-        return content
+    Cached copies are keyed by URL. An unpinned template is used as-is for
+    TEMPLATE_CACHE_MAX_AGE, then revalidated with a conditional request
+    (ETag / Last-Modified). If revalidation fails, the cached copy is used.
 
-    except urllib.error.URLError as e:
-        raise RuntimeError(f"Failed to download template from {TEMPLATE_URL}: {e}")
+    Args:
+        url: Template URL
+        offline: Never touch the network; only use the cache
+        immutable: The URL is pinned to a version, so a cached copy never expires
+
+    Returns the template content on success.
+    Raises RuntimeError if no cached copy exists and it can't be downloaded.
+    """
+    cache_dir = get_template_cache_dir()
+    key = hashlib.sha256(url.encode("utf-8")).hexdigest()[:16]
+    content_path = cache_dir / f"{key}.md"
+    meta_path = cache_dir / f"{key}.json"
+
+    cached = content_path.read_text() if content_path.exists() else None
+    meta: dict = {}
+    if cached is not None and meta_path.exists():
+        try:
+            meta = json.loads(meta_path.read_text())
+        except json.JSONDecodeError:
+            meta = {}
+
+    if cached is not None:
+        if offline or immutable or time.time() - meta.get("checked_at", 0) < TEMPLATE_CACHE_MAX_AGE:
+            return cached
+    elif offline:
+        raise RuntimeError(f"Template not in cache ({cache_dir}) and offline mode is enabled: {url}")
+
+    request = urllib.request.Request(url)
+    if cached is not None:
+        if meta.get("etag"):
+            request.add_header("If-None-Match", meta["etag"])
+        if meta.get("last_modified"):
+            request.add_header("If-Modified-Since", meta["last_modified"])
+        print("Revalidating cached template...", file=sys.stderr)
+    else:
+        print(f"Template not found locally. Downloading from GitHub...", file=sys.stderr)
+
+    try:
+        # Don't let a slow network hold up a run that has a usable cached copy
+        with urllib.request.urlopen(request, timeout=5 if cached is not None else 30) as response:
+            content = response.read().decode("utf-8")
+            meta = {
+                "url": url,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified") or formatdate(usegmt=True),
+            }
+    except urllib.error.HTTPError as e:
+        if cached is None:
+            raise RuntimeError(f"Failed to download template from {url}: {e}")
+        if e.code != 304:
+            print(f"Warning: Could not revalidate template ({e}), using cached copy", file=sys.stderr)
+        content = cached
+    except (urllib.error.URLError, OSError) as e:
+        if cached is None:
+            raise RuntimeError(f"Failed to download template from {url}: {e}")
+        print(f"Warning: Could not revalidate template ({e}), using cached copy", file=sys.stderr)
+        content = cached
+
+    meta["url"] = url
+    meta["checked_at"] = time.time()
+    try:
+        if content != cached:
+            write_file_atomic(content_path, content)
+        write_file_atomic(meta_path, json.dumps(meta, indent=2))
     except OSError as e:
-        raise RuntimeError(f"Failed to save template to {template_path}: {e}")
+        print(f"Warning: Could not update template cache {cache_dir}: {e}", file=sys.stderr)
 
+    return content
 
-def read_template(project_root: Path) -> str:
+
+def read_template(project_root: Path, version: str | None = None, offline: bool = False) -> str:
     """Read the task template file and strip documentation comments.
 
-    If the template doesn't exist locally, downloads it from GitHub.
+    Uses the project's docs/system/delivery/task-template.md when it exists.
+    Otherwise the template comes from the shared user cache (downloaded from
+    GitHub if needed) and a copy is saved to the project for customization.
+    A pinned version always comes from the cache and is not saved.
     """
-    template_path = project_root / "docs" / "system" / "delivery" / "task-template.md"
+    template_path = project_root / TEMPLATE_PATH
 
-    if template_path.exists():
+    if version:
+        content = download_template(get_template_url(version), offline=offline, immutable=True)
+    elif template_path.exists():
         content = template_path.read_text()
     else:
-        content = download_template(template_path)
+        content = download_template(get_template_url(), offline=offline)
+        try:
+            template_path.parent.mkdir(parents=True, exist_ok=True)
+            template_path.write_text(content)
+            print(f"Template saved to: {template_path}", file=sys.stderr)
+        except OSError as e:
+            raise RuntimeError(f"Failed to save template to {template_path}: {e}")
 
     return strip_template_comment(content)
 
 
-def generate_task_content(
-    template: str,
+def build_task_variables(
     epic_number: int,
     epic_title: str,
     epic_type: str,
     repo_name: str,
     task: dict,
-) -> tuple[str, bool]:
-    """Generate content for a single task file.
+    wave: int | str | None = None,
+) -> tuple[dict[str, str], bool]:
+    """Build the template variables for a single task.
+
+    WAVE is empty when no wave is given (waves weren't requested).
 
     Returns:
-        Tuple of (content, used_fallback) where used_fallback indicates
+        Tuple of (variables, used_fallback) where used_fallback indicates
         if any fallback content was used for architect fields.
     """
     # Parse architect response
@@ -323,7 +696,10 @@ def generate_task_content(
         "BLOCKS": format_dependencies(task.get("blocks", []), epic_number),
         "WORKSPACE_PATH": compute_workspace_path(epic_number, repo_name),
         "BRANCH": compute_branch_name(epic_type, epic_number, epic_title),
+        "EFFORT": task.get("effort", "M"),
         "EFFORT_ESTIMATE": EFFORT_MAP.get(task.get("effort", "M"), task.get("effort", "TBD")),
+        "CATEGORY": task.get("category", ""),
+        "WAVE": str(wave) if wave is not None else "",
     }
 
     # Add architect sections with fallbacks
@@ -334,63 +710,176 @@ def generate_task_content(
             variables[key] = FALLBACKS[key]
             used_fallback = True
 
-    # Substitute all variables
-    content = substitute_template(template, variables)
+    return variables, used_fallback
 
-    return content, used_fallback
+
+def generate_task_content(
+    template: list[str],
+    epic_number: int,
+    epic_title: str,
+    epic_type: str,
+    repo_name: str,
+    task: dict,
+    wave: int | str | None = None,
+) -> tuple[str, bool]:
+    """Generate content for a single task file.
+
+    Args:
+        template: Template compiled with compile_template()
+
+    Returns:
+        Tuple of (content, used_fallback) where used_fallback indicates
+        if any fallback content was used for architect fields.
+    """
+    variables, used_fallback = build_task_variables(
+        epic_number, epic_title, epic_type, repo_name, task, wave
+    )
+    return render_template(template, variables), used_fallback
+
+
+def load_shared_inputs(project_root: Path, template_version: str | None = None, offline: bool = False) -> dict:
+    """Load what every epic of a project shares: the compiled template and valid labels.
+
+    Returns:
+        Dict with "template" (compiled) and "labels" (the LabelRegistry).
+    """
+    # Read and compile the template once for all tasks
+    template = compile_template(read_template(project_root, version=template_version, offline=offline))
+
+    # Load valid labels for validation
+    labels = load_label_registry(project_root)
+    if not labels.exists:
+        print("Note: task-labels.md not found, skipping label validation", file=sys.stderr)
+    elif len(labels) == 0:
+        print("Warning: task-labels.md found but no labels parsed", file=sys.stderr)
+
+    return {"template": template, "labels": labels}
+
+
+def check_template_variables(compiled: list[str], variables: dict[str, str]) -> tuple[list[str], list[str]]:
+    """Compare a template's placeholders with the variables it is rendered with.
+
+    Returns:
+        Tuple of (unresolved, unused): placeholders without a value, and
+        variables the template never uses.
+    """
+    placeholders = template_placeholders(compiled)
+    unresolved = sorted(placeholders - variables.keys())
+    unused = sorted(variables.keys() - placeholders)
+    return unresolved, unused
 
 
 def generate_task_files(
     input_data: dict,
     project_root: Path,
     dry_run: bool = False,
+    template_version: str | None = None,
+    offline: bool = False,
+    waves: bool = False,
+    shared: dict | None = None,
+    render_cache: dict[int, tuple[str, tuple[int, int] | None, bool]] | None = None,
 ) -> dict:
     """Generate all task files from input data.
 
-    Returns summary dict with status, files created, etc.
+    Each rendered task is compared with the existing file by content hash and
+    only written (atomically) when it differs, so unchanged files keep their
+    mtime. The dependency graph is validated and its schedule included in the
+    summary; with waves=True each task also gets a WAVE variable, which needs
+    the whole graph up front, so streamed tasks are buffered.
+
+    Args:
+        shared: Result of load_shared_inputs() for project_root, to reuse the
+            compiled template and label set across epics; loaded if omitted.
+        render_cache: Per-task input digests from an earlier run with the same
+            template (watch mode). A task whose inputs and output file haven't
+            changed since is reported unchanged without being re-rendered.
+            Updated in place.
+
+    Returns summary dict with status, files created/updated/unchanged, etc.
     """
     epic_number = input_data["epic_number"]
     epic_title = input_data["epic_title"]
     epic_type = input_data["epic_type"]
     output_dir = Path(input_data["output_dir"])
-    tasks = input_data["tasks"]
+    tasks: Iterable[dict] = input_data["tasks"]
 
     # Derive repo name from project root directory name
-    repo_name = project_root.name
+    repo_name = project_root.resolve().name
 
     # Make output_dir absolute if relative
     if not output_dir.is_absolute():
         output_dir = project_root / output_dir
 
-    # Read template
-    template = read_template(project_root)
-
-    # Load valid labels for validation
-    valid_labels = parse_valid_labels(project_root)
-    if valid_labels is None:
-        print("Note: task-labels.md not found, skipping label validation", file=sys.stderr)
-    elif len(valid_labels) == 0:
-        print("Warning: task-labels.md found but no labels parsed", file=sys.stderr)
+    if shared is None:
+        shared = load_shared_inputs(project_root, template_version, offline)
+    template = shared["template"]
+    labels = shared["labels"]
 
     # Ensure output directory exists
     if not dry_run:
         output_dir.mkdir(parents=True, exist_ok=True)
 
-    files_created: list[str] = []
+    files: list[str] = []
+    changes: dict[str, list[str]] = {"created": [], "updated": [], "unchanged": []}
     fallbacks_used = 0
     label_warnings: list[str] = []
+    unresolved: list[str] = []
+    unused: list[str] = []
+    graph: list[dict] = []
+    rendered = 0
+    epic_key = [epic_number, epic_title, epic_type, repo_name]
+    analysis: dict | None = None
+    task_waves: dict[int, int] = {}
+
+    # WAVE needs the whole graph before the first task is rendered
+    if waves:
+        tasks = list(tasks)
+        analysis = analyze_dependencies([dependency_fields(t) for t in tasks], epic_number)
+        task_waves = {seq: level for level, seqs in enumerate(analysis["waves"], start=1) for seq in seqs}
+
+    def stream_tasks() -> Iterator[dict]:
+        """Iterate tasks, recording the files already written if the stream turns out invalid."""
+        try:
+            yield from tasks
+        except InputError as e:
+            e.written = [] if dry_run else changes["created"] + changes["updated"]
+            raise
+
+    # Tasks may be a stream (JSONL input), so only one task is held at a time
+    for task in stream_tasks():
+        wave = task_waves.get(task["sequence"], "TBD") if waves else None
+
+        # Every task defines the same variable names, so check them once
+        if not files:
+            sample_variables, _ = build_task_variables(epic_number, epic_title, epic_type, repo_name, task, wave)
+            unresolved, unused = check_template_variables(template, sample_variables)
+            for name in unresolved:
+                print(f"[WARN] Template placeholder {{{{{name}}}}} has no value and is left as-is", file=sys.stderr)
+            for name in unused:
+                print(f"Note: Variable {name} is not used by the template", file=sys.stderr)
 
-    for task in tasks:
         seq = task["sequence"]
         filename = f"TASK-{epic_number}.{seq:02d}.md"
+        files.append(filename)
+        if analysis is None:
+            graph.append(dependency_fields(task))
         filepath = output_dir / filename
         task_id = f"TASK-{epic_number}.{seq:02d}"
 
         # Validate labels
         task_labels = task.get("labels", [])
-        warnings = validate_labels(task_labels, valid_labels, task_id)
+        warnings = validate_labels(task_labels, labels, task_id)
         label_warnings.extend(warnings)
 
+        if render_cache is not None:
+            digest = content_digest(json.dumps([epic_key, task, wave], sort_keys=True).encode())
+            cached = render_cache.get(seq)
+            if cached and cached[0] == digest and cached[1] == file_state(filepath):
+                fallbacks_used += cached[2]
+                changes["unchanged"].append(filename)
+                continue
+
+        rendered += 1
         content, used_fallback = generate_task_content(
             template=template,
             epic_number=epic_number,
@@ -398,35 +887,127 @@ def generate_task_files(
             epic_type=epic_type,
             repo_name=repo_name,
             task=task,
+            wave=wave,
         )
 
         if used_fallback:
             fallbacks_used += 1
 
+        change = classify_task_file(filepath, content)
+        changes[change].append(filename)
+
         if dry_run:
-            print(f"[DRY RUN] Would create: {filepath}")
+            action = {"created": "create", "updated": "update", "unchanged": "leave unchanged"}[change]
+            print(f"[DRY RUN] Would {action}: {filepath}")
             print(f"  Title: {task['title']}")
             print(f"  Effort: {task.get('effort', 'M')}")
             print(f"  Labels: {task.get('labels', [])}")
             print(f"  Dependencies: blocked_by={task.get('blocked_by', [])}, blocks={task.get('blocks', [])}")
+            if wave is not None:
+                print(f"  Wave: {wave}")
             print(f"  Architect response: {'present' if task.get('architect_response') else 'missing (using fallbacks)'}")
             print()
-        else:
-            filepath.write_text(content)
-            files_created.append(filename)
+        elif change != "unchanged":
+            write_file_atomic(filepath, content)
+
+        if render_cache is not None:
+            render_cache[seq] = (digest, file_state(filepath), used_fallback)
 
     # Print label warnings to stderr
     for warning in label_warnings:
         print(warning, file=sys.stderr)
 
-    return {
-        "status": "success",
-        "tasks_generated": len(files_created) if not dry_run else len(tasks),
+    if analysis is None:
+        analysis = analyze_dependencies(graph, epic_number)
+    for error in analysis["errors"]:
+        print(f"[ERROR] Dependencies: {error}", file=sys.stderr)
+    for warning in analysis["warnings"]:
+        print(f"[WARN] Dependencies: {warning}", file=sys.stderr)
+
+    # The files are written either way (streamed tasks can't be checked up front),
+    # but an invalid graph fails the run
+    result = {
+        "status": "success" if analysis["valid"] else "error",
+        "tasks_generated": len(files),
+        "rendered": rendered,
         "output_dir": str(output_dir),
-        "files": files_created if not dry_run else [f"TASK-{epic_number}.{t['sequence']:02d}.md" for t in tasks],
+        "files": files,
+        "created": changes["created"],
+        "updated": changes["updated"],
+        "unchanged": changes["unchanged"],
         "fallbacks_used": fallbacks_used,
         "invalid_labels": len(label_warnings),
+        "unresolved_placeholders": unresolved,
+        "unused_variables": unused,
+        "dependencies": analysis,
     }
+    if not analysis["valid"]:
+        result["error"] = "Invalid dependency graph: " + "; ".join(analysis["errors"])
+    return result
+
+
+class InputError(Exception):
+    """An input file that can't be read, parsed or is missing required fields.
+
+    When a streamed (JSONL) input fails part-way, written lists the task
+    files that were already written before the bad line.
+    """
+
+    def __init__(self, message: str, written: list[str] | None = None):
+        super().__init__(message)
+        self.written = written or []
+
+    def __str__(self) -> str:
+        message = super().__str__()
+        if self.written:
+            message += f" (already written: {', '.join(self.written)})"
+        return message
+
+
+def iter_jsonl_tasks(stream: TextIO, start_line: int) -> Iterator[dict]:
+    """Yield one task per non-blank JSONL line, reporting line numbers on errors.
+
+    Raises:
+        InputError: If a line isn't a JSON object (tasks before it have been yielded).
+    """
+    for line_number, line in enumerate(stream, start=start_line):
+        if not line.strip():
+            continue
+        try:
+            task = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise InputError(f"Invalid JSON on input line {line_number}: {e}") from e
+        if not isinstance(task, dict):
+            raise InputError(f"Input line {line_number} must be a task object")
+        yield task
+
+
+def read_jsonl_input(stream: TextIO) -> dict:
+    """Read the epic metadata header of a JSONL input.
+
+    Returns:
+        The header dict with "tasks" set to a lazy iterator over the
+        remaining lines, which must be consumed while the stream is open.
+
+    Raises:
+        ValueError: If the header line is missing or not a JSON object.
+    """
+    line_number = 0
+    for line_number, line in enumerate(stream, start=1):
+        if line.strip():
+            break
+    else:
+        raise ValueError("JSONL input is empty; expected an epic metadata line")
+
+    try:
+        header = json.loads(line)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid JSON on input line {line_number}: {e}") from e
+    if not isinstance(header, dict):
+        raise ValueError(f"Input line {line_number} must be an object with the epic metadata")
+
+    header["tasks"] = iter_jsonl_tasks(stream, line_number + 1)
+    return header
 
 
 def find_project_root(start_path: Path) -> Path:
@@ -442,13 +1023,235 @@ def find_project_root(start_path: Path) -> Path:
     return Path.cwd()
 
 
+REQUIRED_FIELDS = ["epic_number", "epic_title", "epic_type", "output_dir", "tasks"]
+
+
+def expand_inputs(patterns: list[str]) -> list[str]:
+    """Expand glob patterns (for shells that don't, or quoted patterns) into input paths.
+
+    Existing paths and "-" are kept as given; duplicates are dropped.
+
+    Raises:
+        InputError: If a pattern matches nothing.
+    """
+    inputs: list[str] = []
+    for pattern in patterns:
+        if pattern == "-" or Path(pattern).exists() or not glob.has_magic(pattern):
+            matches = [pattern]
+        else:
+            matches = sorted(glob.glob(pattern, recursive=True))
+            if not matches:
+                raise InputError(f"No input files match: {pattern}")
+        inputs.extend(m for m in matches if m not in inputs)
+    return inputs
+
+
+def input_project_root(input_arg: str, project_root: Path | None) -> Path:
+    """Project root for an input: the explicit one, else detected from the input's location."""
+    if project_root:
+        return project_root
+    return find_project_root(Path.cwd() if input_arg == "-" else Path(input_arg))
+
+
+def run_input(
+    input_arg: str,
+    jsonl: bool,
+    project_root: Path,
+    options: dict,
+    shared: dict | None = None,
+    render_cache: dict | None = None,
+) -> dict:
+    """Read one JSON/JSONL input ("-" for stdin) and generate its task files.
+
+    Args:
+        options: generate_task_files keyword arguments (dry_run, template_version, offline, waves)
+
+    Raises:
+        InputError: If the input can't be read or is invalid.
+    """
+    from_stdin = input_arg == "-"
+    input_path = Path(input_arg)
+    jsonl = jsonl or input_path.suffix == ".jsonl"
+    if not from_stdin and not input_path.exists():
+        raise InputError(f"Input file not found: {input_path}")
+
+    stream = sys.stdin if from_stdin else open(input_path)
+    try:
+        # Read input JSON (for JSONL only the header; tasks are read while generating)
+        try:
+            input_data = read_jsonl_input(stream) if jsonl else json.load(stream)
+        except json.JSONDecodeError as e:
+            raise InputError(f"Invalid JSON in input file: {e}") from e
+        except ValueError as e:
+            raise InputError(str(e)) from e
+
+        # Validate required fields
+        missing = [f for f in REQUIRED_FIELDS if f not in input_data]
+        if missing:
+            raise InputError(f"Missing required fields in input: {missing}")
+
+        return generate_task_files(
+            input_data=input_data, project_root=project_root, shared=shared, render_cache=render_cache, **options
+        )
+    finally:
+        if not from_stdin:
+            stream.close()
+
+
+def run_batch_input(input_arg: str, jsonl: bool, project_root: Path, options: dict, shared: dict) -> tuple[dict, str, str]:
+    """Run one input of a batch, capturing its output so concurrent epics don't interleave.
+
+    Returns:
+        Tuple of (result, stdout, stderr); result has "input" and, on failure,
+        status "error" with the message.
+    """
+    out, err = io.StringIO(), io.StringIO()
+    with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+        try:
+            result = {"input": input_arg, **run_input(input_arg, jsonl, project_root, options, shared)}
+        except InputError as e:
+            result = {"input": input_arg, "status": "error", "error": str(e), "written": e.written}
+        except Exception as e:
+            result = {"input": input_arg, "status": "error", "error": f"Error generating task files: {e}"}
+        if result["status"] == "error":
+            print(f"Error: {input_arg}: {result['error']}", file=sys.stderr)
+    return result, out.getvalue(), err.getvalue()
+
+
+def run_batch(inputs: list[str], jsonl: bool, project_root: Path | None, options: dict, jobs: int) -> dict:
+    """Generate task files for many epics in one process.
+
+    The template and labels are loaded once per project root and shared by
+    every epic; with jobs > 1 epics are rendered in parallel processes. Each
+    epic's output is replayed in input order.
+
+    Returns:
+        Batch summary with per-epic results and totals.
+    """
+    roots = {input_arg: input_project_root(input_arg, project_root) for input_arg in inputs}
+    shared: dict[Path, dict] = {}
+    for root in roots.values():
+        if root not in shared:
+            shared[root] = load_shared_inputs(root, options["template_version"], options["offline"])
+
+    args = [(input_arg, jsonl, roots[input_arg], options, shared[roots[input_arg]]) for input_arg in inputs]
+    if jobs > 1 and len(inputs) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(inputs))) as executor:
+            outcomes = list(executor.map(run_batch_input, *zip(*args)))
+    else:
+        outcomes = [run_batch_input(*a) for a in args]
+
+    results = []
+    for result, out, err in outcomes:
+        sys.stdout.write(out)
+        sys.stderr.write(err)
+        results.append(result)
+
+    succeeded = [r for r in results if r["status"] != "error"]
+    # Epics that failed only on their dependency graph still wrote their files
+    generated = [r for r in results if "files" in r]
+    totals = {
+        key: sum(len(r[key]) if isinstance(r[key], list) else r[key] for r in generated)
+        for key in ("tasks_generated", "created", "updated", "unchanged", "fallbacks_used", "invalid_labels")
+    }
+    return {
+        "status": "success" if len(succeeded) == len(results) else "error",
+        "inputs": len(results),
+        "succeeded": len(succeeded),
+        "failed": len(results) - len(succeeded),
+        "totals": totals,
+        "results": results,
+    }
+
+
+def format_watch_result(input_arg: str, result: dict, elapsed: float) -> str:
+    """One-line summary of a watch run: what changed and how much work was skipped."""
+    parts = [f"{action} {', '.join(name.removesuffix('.md') for name in result[action])}"
+             for action in ("created", "updated") if result[action]]
+    changed = "; ".join(parts) if parts else "no changes"
+    reused = result["tasks_generated"] - result["rendered"]
+    return (
+        f"[{time.strftime('%H:%M:%S')}] {input_arg}: {changed} "
+        f"({len(result['unchanged'])} unchanged, {reused} not re-rendered) in {elapsed * 1000:.0f} ms"
+    )
+
+
+def watch(inputs: list[str], jsonl: bool, project_root: Path | None, options: dict, interval: float) -> None:
+    """Regenerate task files whenever an input, the template or task-labels.md changes.
+
+    Polls file mtimes and sizes (stdlib only). Each input keeps a render cache
+    of per-task input digests, so only tasks whose input changed are
+    re-rendered; a template change invalidates the caches of its project.
+    Errors (e.g. a half-saved input) are reported and watching continues.
+    Runs until interrupted.
+    """
+    roots = {input_arg: input_project_root(input_arg, project_root) for input_arg in inputs}
+    watched = {Path(input_arg) for input_arg in inputs}
+    for root in set(roots.values()):
+        watched.update({root / TEMPLATE_PATH, root / LABELS_PATH})
+
+    shared: dict[Path, dict] = {}
+    render_caches: dict[str, dict] = {input_arg: {} for input_arg in inputs}
+    previous: dict[Path, tuple[int, int] | None] = {}
+
+    print(f"Watching {len(inputs)} input(s) every {interval:g}s; press Ctrl+C to stop", file=sys.stderr)
+    try:
+        while True:
+            state = {path: file_state(path) for path in watched}
+            changed = {path for path in watched if path not in previous or previous[path] != state[path]}
+            previous = state
+
+            for root in set(roots.values()):
+                template_changed = root / TEMPLATE_PATH in changed
+                if root in shared and not template_changed and root / LABELS_PATH not in changed:
+                    continue
+                try:
+                    shared[root] = load_shared_inputs(root, options["template_version"], options["offline"])
+                except Exception as e:
+                    print(f"Error loading template for {root}: {e}", file=sys.stderr)
+                    shared.pop(root, None)
+                    continue
+                if template_changed:
+                    for input_arg, input_root in roots.items():
+                        if input_root == root:
+                            render_caches[input_arg].clear()
+                changed.add(root)
+
+            for input_arg in inputs:
+                root = roots[input_arg]
+                if root not in shared or (Path(input_arg) not in changed and root not in changed):
+                    continue
+                start = time.perf_counter()
+                try:
+                    result = run_input(input_arg, jsonl, root, options, shared[root], render_caches[input_arg])
+                except InputError as e:
+                    print(f"Error: {input_arg}: {e}", file=sys.stderr)
+                    continue
+                except Exception as e:
+                    print(f"Error generating task files for {input_arg}: {e}", file=sys.stderr)
+                    continue
+                print(format_watch_result(input_arg, result, time.perf_counter() - start), flush=True)
+                if result["status"] != "success":
+                    print(f"Error: {input_arg}: {result['error']}", file=sys.stderr)
+
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        print("Stopped watching", file=sys.stderr)
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Generate TASK-*.md files from structured JSON input"
     )
     parser.add_argument(
         "input_json",
-        help="Path to JSON file containing epic metadata and tasks array"
+        nargs="+",
+        help="JSON/JSONL input files or glob patterns ('-' for stdin); several inputs run as one batch"
+    )
+    parser.add_argument(
+        "--jsonl",
+        action="store_true",
+        help="Read JSONL: an epic metadata line, then one task per line (implied by a .jsonl file)"
     )
     parser.add_argument(
         "--dry-run",
@@ -460,42 +1263,91 @@ def main():
         type=Path,
         help="Project root directory (auto-detected if not specified)"
     )
+    parser.add_argument(
+        "--template-version",
+        help="Use the remote template pinned to this tag or commit instead of the project template"
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        default=os.environ.get("NXS_OFFLINE") == "1",
+        help="Never download the template; use the project template or the local cache (also NXS_OFFLINE=1)"
+    )
+    parser.add_argument(
+        "--waves",
+        action="store_true",
+        help="Add a WAVE variable (parallel execution level) to each task; buffers JSONL input"
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Epics to render in parallel in batch mode (default: 1)"
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and regenerate when an input, the template or task-labels.md changes"
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=0.5,
+        help="Seconds between change checks in watch mode (default: 0.5)"
+    )
 
     args = parser.parse_args()
 
-    # Read input JSON
-    input_path = Path(args.input_json)
-    if not input_path.exists():
-        print(f"Error: Input file not found: {input_path}", file=sys.stderr)
-        sys.exit(1)
+    options = {
+        "dry_run": args.dry_run,
+        "template_version": args.template_version,
+        "offline": args.offline,
+        "waves": args.waves,
+    }
 
     try:
-        with open(input_path) as f:
-            input_data = json.load(f)
-    except json.JSONDecodeError as e:
-        print(f"Error: Invalid JSON in input file: {e}", file=sys.stderr)
-        sys.exit(1)
-
-    # Validate required fields
-    required_fields = ["epic_number", "epic_title", "epic_type", "output_dir", "tasks"]
-    missing = [f for f in required_fields if f not in input_data]
-    if missing:
-        print(f"Error: Missing required fields in input: {missing}", file=sys.stderr)
+        inputs = expand_inputs(args.input_json)
+    except InputError as e:
+        print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
 
-    # Find project root
-    project_root = args.project_root or find_project_root(input_path)
+    if args.watch:
+        if "-" in inputs:
+            print("Error: stdin ('-') can't be watched", file=sys.stderr)
+            sys.exit(1)
+        watch(inputs, args.jsonl, args.project_root, options, args.interval)
+        return
+
+    if len(inputs) > 1:
+        if "-" in inputs:
+            print("Error: stdin ('-') can't be combined with other inputs", file=sys.stderr)
+            sys.exit(1)
+        try:
+            result = run_batch(inputs, args.jsonl, args.project_root, options, args.jobs)
+        except FileNotFoundError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        except Exception as e:
+            print(f"Error generating task files: {e}", file=sys.stderr)
+            sys.exit(1)
+        print(json.dumps(result, indent=2))
+        if result["status"] != "success":
+            sys.exit(1)
+        return
 
+    input_arg = inputs[0]
     try:
-        result = generate_task_files(
-            input_data=input_data,
-            project_root=project_root,
-            dry_run=args.dry_run,
-        )
+        result = run_input(input_arg, args.jsonl, input_project_root(input_arg, args.project_root), options)
 
         # Output result as JSON
         print(json.dumps(result, indent=2))
+        if result["status"] != "success":
+            print(f"Error: {result['error']}", file=sys.stderr)
+            sys.exit(1)
 
+    except InputError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
     except FileNotFoundError as e:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
@@ -3,9 +3,13 @@
 nxs_gh_create_epic.py
 
 Creates a GitHub issue from an Epic document, adds it to a GitHub project,
-and updates its frontmatter with the issue link.
+and updates its frontmatter with the issue link. With --with-tasks, the
+epic's TASK files are published in the same run as sub-issues of the epic.
+With --all, every epic.md under docs/features is published in one run.
 
-Usage: python nxs_gh_create_epic.py [--project "<project-name>"] <path-to-epic.md>
+Usage:
+    python nxs_gh_create_epic.py [--project "<project-name>"] [--with-tasks] <path-to-epic.md>
+    python nxs_gh_create_epic.py --all [<features-root>] [--jobs 4] [--project "<project-name>"]
 
 Prerequisites:
     - GitHub CLI (gh) must be installed and authenticated
@@ -14,14 +18,25 @@ Prerequisites:
 """
 
 import argparse
-import json
 import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import shutil
 import subprocess
 import sys
 import tempfile
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "lib"))
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "nxs-gh-create-task" / "scripts"))
+
+import create_gh_issues  # noqa: E402
+from gh_projects import find_project  # noqa: E402
+from repo_meta import get_repo_meta  # noqa: E402
+
+
+# Default root scanned by --all, relative to the project root
+FEATURES_PATH = Path("docs") / "features"
+
 
 class Colors:
     RED = "\033[0;31m"
@@ -131,216 +146,140 @@ def update_frontmatter_with_link(content: str, issue_num: str) -> str:
     return "\n".join(lines)
 
 
-def get_project_id_by_name(project_name: str) -> str | None:
-    """Get the node ID of a project by its name.
-    
-    The project_name can be in format:
-    - "owner/project-number" (e.g., "my-org/1")
-    - "project-number" (uses current repo's owner)
-    
+def write_links(links: dict[Path, str]) -> int:
+    """Write issue links into the frontmatter of each file, atomically.
+
     Args:
-        project_name: The project identifier
-        
+        links: File path -> issue number
+
     Returns:
-        The project node ID (e.g., "PVT_kwHOABC123") or None if not found.
+        Number of files updated.
     """
-    # Parse project name to extract owner and number
-    if "/" in project_name:
-        owner, project_num = project_name.rsplit("/", 1)
-    else:
-        # Get owner from current repo
-        result = run_command(["gh", "repo", "view", "--json", "owner", "--jq", ".owner.login"])
-        if result.returncode != 0:
-            warn(f"Error getting repo owner: {result.stderr}")
-            return None
-        owner = result.stdout.strip()
-        project_num = project_name
-
-    # Try to parse as a number for project lookup
-    try:
-        project_number = int(project_num)
-    except ValueError:
-        # Not a number, try to find project by title
-        return get_project_id_by_title(owner, project_num)
-
-    # Query for project by number
-    query = """
-    query($owner: String!, $number: Int!) {
-        organization(login: $owner) {
-            projectV2(number: $number) {
-                id
-                title
-            }
-        }
-    }
+    written = 0
+    for path, issue_num in links.items():
+        content = path.read_text(encoding="utf-8")
+        updated = update_frontmatter_with_link(content, issue_num)
+        if updated == content:
+            continue
+        mode = path.stat().st_mode & 0o7777
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        try:
+            # mkstemp creates 0600 files; keep the original permissions
+            Path(tmp_path).chmod(mode)
+            with open(fd, "w", encoding="utf-8") as f:
+                f.write(updated)
+            Path(tmp_path).replace(path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+        written += 1
+    return written
+
+
+def load_epic_tasks(epic_file: Path) -> tuple[list[Path], dict[Path, tuple[dict, str]]]:
+    """Find and parse the TASK files in the epic's tasks/ folder."""
+    tasks_dir = epic_file.parent / "tasks"
+    if not tasks_dir.is_dir():
+        return [], {}
+    task_files = create_gh_issues.find_task_files(str(tasks_dir))
+    return task_files, create_gh_issues.load_task_files(task_files)
+
+
+def publish_epic_tasks(
+    task_files: list[Path],
+    tasks: dict[Path, tuple[dict, str]],
+    issue_num: str,
+    project_id: str | None,
+    skip_project: bool,
+    project_root: Path,
+    links: dict[Path, str],
+    publish_dependencies: bool = True,
+) -> int:
+    """Publish the epic's TASK files as sub-issues of the epic.
+
+    Reuses the epic's issue number and project ID; tasks that already have
+    a link are skipped, so an interrupted run can simply be repeated.
+
+    Args:
+        links: Collects task file -> created issue number for the final
+            frontmatter writeback, also when publishing stops early
+
+    Returns:
+        Number of task files processed successfully.
     """
-    
-    cmd = [
-        "gh", "api", "graphql",
-        "-f", f"query={query}",
-        "-f", f"owner={owner}",
-        "-F", f"number={project_number}"
-    ]
-    
-    result = run_command(cmd)
-    
-    # If org query fails, try user query
-    if result.returncode != 0 or "organization" not in result.stdout:
-        query = """
-        query($owner: String!, $number: Int!) {
-            user(login: $owner) {
-                projectV2(number: $number) {
-                    id
-                    title
-                }
-            }
-        }
-        """
-        cmd = [
-            "gh", "api", "graphql",
-            "-f", f"query={query}",
-            "-f", f"owner={owner}",
-            "-F", f"number={project_number}"
-        ]
-        result = run_command(cmd)
-    
-    if result.returncode != 0:
-        warn(f"Error fetching project: {result.stderr}")
-        return None
-    
+    parent_ref = f"#{issue_num}"
+    for task_file, (frontmatter, _) in tasks.items():
+        parent = frontmatter.get("parent", "")
+        if not parent:
+            frontmatter["parent"] = parent_ref
+        elif create_gh_issues.normalize_issue_ref(str(parent)) != issue_num:
+            warn(f"{task_file.name}: parent {parent} is not the epic ({parent_ref}), keeping it")
+
+    created_tasks: dict[str, tuple[str, str]] = {}
+    field_map = create_gh_issues.load_project_field_map(project_root)
     try:
-        data = json.loads(result.stdout)
-        # Check both org and user responses
-        project = (
-            data.get("data", {}).get("organization", {}).get("projectV2") or
-            data.get("data", {}).get("user", {}).get("projectV2")
+        success_count, _ = create_gh_issues.process_epic_folder(
+            task_files, tasks, project_id, skip_project=skip_project,
+            field_map=field_map, created_tasks=created_tasks
         )
-        if project:
-            print(f"📊 Found project: {project.get('title', 'Unknown')}")
-            return project.get("id")
-        return None
-    except json.JSONDecodeError as e:
-        warn(f"Error parsing project response: {e}")
-        return None
+    finally:
+        for task_file, (frontmatter, _) in tasks.items():
+            task_id = create_gh_issues.get_task_id(task_file, frontmatter)
+            if task_id in created_tasks:
+                links[task_file] = created_tasks[task_id][0]
 
+    if created_tasks and publish_dependencies:
+        task_issues = create_gh_issues.load_linked_tasks(tasks)
+        task_issues.update({task_id: number for task_id, (number, _) in created_tasks.items()})
+        print("🔗 Publishing task dependencies...")
+        create_gh_issues.publish_task_dependencies(created_tasks, task_issues)
+
+    return success_count
+
+
+def get_project_id_by_name(project_name: str) -> str | None:
+    """Get the node ID of a project by its name.
+
+    The project_name can be in format:
+    - "owner/project-number" (e.g., "my-org/1")
+    - "owner/project-title"
+    - "project-number" or "project-title" (uses current repo's owner)
+
+    Titles must match exactly (case-insensitive).
 
-def get_project_id_by_title(owner: str, title: str) -> str | None:
-    """Get the node ID of a project by searching for its title.
-    
-    Args:
-        owner: The organization or user login
-        title: The project title to search for
-        
     Returns:
-        The project node ID or None if not found.
-    """
-    query = """
-    query($owner: String!, $title: String!) {
-        organization(login: $owner) {
-            projectsV2(first: 100, query: $title) {
-                nodes {
-                    id
-                    title
-                }
-            }
-        }
-    }
+        The project node ID (e.g., "PVT_kwHOABC123") or None if not found.
     """
-    
-    cmd = [
-        "gh", "api", "graphql",
-        "-f", f"query={query}",
-        "-f", f"owner={owner}",
-        "-f", f"title={title}"
-    ]
-    
-    result = run_command(cmd)
-    
-    # If org query fails, try user query
-    if result.returncode != 0:
-        query = """
-        query($owner: String!, $title: String!) {
-            user(login: $owner) {
-                projectsV2(first: 100, query: $title) {
-                    nodes {
-                        id
-                        title
-                    }
-                }
-            }
-        }
-        """
-        cmd = [
-            "gh", "api", "graphql",
-            "-f", f"query={query}",
-            "-f", f"owner={owner}",
-            "-f", f"title={title}"
-        ]
-        result = run_command(cmd)
-    
-    if result.returncode != 0:
-        warn(f"Error searching for project: {result.stderr}")
-        return None
-    
     try:
-        data = json.loads(result.stdout)
-        nodes = (
-            data.get("data", {}).get("organization", {}).get("projectsV2", {}).get("nodes", []) or
-            data.get("data", {}).get("user", {}).get("projectsV2", {}).get("nodes", [])
-        )
-        # Find exact match
-        for node in nodes:
-            if node.get("title", "").lower() == title.lower():
-                print(f"📊 Found project: {node.get('title', 'Unknown')}")
-                return node.get("id")
-        # If no exact match, use first result
-        if nodes:
-            project = nodes[0]
-            print(f"📊 Found project: {project.get('title', 'Unknown')}")
-            return project.get("id")
+        project = find_project(project_name)
+    except RuntimeError as e:
+        warn(f"Error fetching project: {e}")
         return None
-    except json.JSONDecodeError as e:
-        warn(f"Error parsing project response: {e}")
+
+    if not project:
         return None
+    print(f"📊 Found project: {project.get('title', 'Unknown')}")
+    return project.get("id")
 
 
 def get_repo_project_id() -> str | None:
     """Get the node ID of the first project associated with the current repository.
     
+    Comes from the shared repository metadata cache (.tmp/repo-meta.json).
+    
     Returns:
         The project node ID (e.g., "PVT_kwHOABC123") or None if no project found.
     """
-    query = """
-    query {
-        repository(owner: "{owner}", name: "{repo}") {
-            projectsV2(first: 1) {
-                nodes {
-                    id
-                    title
-                }
-            }
-        }
-    }
-    """
-    
-    cmd = ["gh", "api", "graphql", "-f", f"query={query}"]
-    
-    result = run_command(cmd)
-    if result.returncode != 0:
-        warn(f"Error fetching repository projects: {result.stderr}")
-        return None
-    
     try:
-        data = json.loads(result.stdout)
-        nodes = data.get("data", {}).get("repository", {}).get("projectsV2", {}).get("nodes", [])
-        if nodes:
-            project = nodes[0]
-            print(f"📊 Found project: {project.get('title', 'Unknown')}")
-            return project.get("id")
+        project = get_repo_meta()["project"]
+    except RuntimeError as e:
+        warn(f"Error fetching repository projects: {e}")
         return None
-    except json.JSONDecodeError as e:
-        warn(f"Error parsing project response: {e}")
+    
+    if not project:
         return None
+    print(f"📊 Found project: {project.get('title', 'Unknown')}")
+    return project.get("id")
 
 
 def get_issue_id(issue_number: str) -> str | None:
@@ -426,6 +365,137 @@ def create_github_issue(title: str, label: str, body_file: Path) -> tuple[str, s
     return issue_url, match.group(1)
 
 
+def create_epic_issue(
+    epic_title: str, epic_type: str, body: str, project_id: str | None, quiet: bool = False
+) -> tuple[str, str, str | None]:
+    """Create the epic issue and add it to the project.
+
+    Args:
+        quiet: If True, don't print progress (for concurrent workers)
+
+    Returns:
+        Tuple of (issue_url, issue_number, issue node ID if it was looked up).
+        Raises RuntimeError on failure.
+    """
+    # Create temp file with body content
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".md", delete=False, encoding="utf-8") as tmp:
+        tmp.write(body)
+        temp_file = Path(tmp.name)
+
+    try:
+        if not quiet:
+            print("🚀 Creating GitHub issue...")
+
+        issue_url, issue_num = create_github_issue(epic_title, epic_type, temp_file)
+        issue_id = None
+
+        # Add to project if available
+        if project_id:
+            issue_id = get_issue_id(issue_num)
+            if issue_id:
+                if add_issue_to_project(project_id, issue_id):
+                    if not quiet:
+                        print("📊 Added to project")
+                else:
+                    warn("Failed to add issue to project")
+
+        return issue_url, issue_num, issue_id
+
+    finally:
+        # Cleanup temp file
+        temp_file.unlink(missing_ok=True)
+
+
+def load_epics(root: Path) -> dict[Path, tuple[dict[str, str], str]]:
+    """Find and parse every epic.md beneath root, sorted by path."""
+    return {
+        epic_file: parse_frontmatter(epic_file.read_text(encoding="utf-8"))
+        for epic_file in sorted(root.rglob("epic.md"))
+    }
+
+
+def publish_all_epics(root: Path, project_id: str | None, jobs: int) -> int:
+    """Create issues for every unlinked epic beneath root.
+
+    Epics that already have a link are skipped without prompting. The
+    others are created concurrently, and all links are written back in one
+    atomic pass at the end, including when the run stops early.
+
+    Returns:
+        Exit code (1 if any epic failed or was invalid).
+    """
+    epics = load_epics(root)
+    if not epics:
+        print(f"No epic.md files found in {root}")
+        return 0
+
+    pending: dict[Path, tuple[str, str, str]] = {}
+    invalid = 0
+    for epic_file, (frontmatter, body) in epics.items():
+        name = epic_file.relative_to(root)
+        if frontmatter.get("link"):
+            print(f"⏭️  {name}: already published as {frontmatter['link']}")
+        elif not frontmatter.get("epic"):
+            error(f"{name}: no 'epic' field found in frontmatter")
+            invalid += 1
+        elif not body.strip():
+            error(f"{name}: no content found after frontmatter")
+            invalid += 1
+        else:
+            pending[epic_file] = (frontmatter["epic"], frontmatter.get("type") or "epic", body)
+
+    print(f"📂 Found {len(epics)} epic(s): {len(pending)} to publish, {len(epics) - len(pending) - invalid} already linked")
+    if not pending:
+        return 1 if invalid else 0
+
+    links: dict[Path, str] = {}
+    failed = 0
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+            futures = {
+                executor.submit(create_epic_issue, title, label, body, project_id, True): epic_file
+                for epic_file, (title, label, body) in pending.items()
+            }
+            for future in as_completed(futures):
+                epic_file = futures[future]
+                name = epic_file.relative_to(root)
+                try:
+                    _, issue_num, _ = future.result()
+                except RuntimeError as e:
+                    error(f"{name}: {e}")
+                    failed += 1
+                    continue
+                links[epic_file] = issue_num
+                success(f"{name}: #{issue_num} {pending[epic_file][0]}")
+    finally:
+        if links:
+            print("📝 Updating frontmatter with links...")
+            write_links(links)
+
+    print()
+    print(f"   Published {len(links)}/{len(pending)} epic(s)")
+    return 1 if failed or invalid else 0
+
+
+def resolve_project_id(args: argparse.Namespace) -> str | None:
+    """Resolve the project every issue of the run is added to."""
+    if args.no_project:
+        return None
+    if args.project:
+        # Use explicitly provided project
+        print(f"🔍 Looking up project: {args.project}")
+        project_id = get_project_id_by_name(args.project)
+        if not project_id:
+            warn(f"Project '{args.project}' not found, issue will not be added to a project")
+        return project_id
+    # Auto-discover from repository
+    print("🔍 Looking for repository project...")
+    project_id = get_repo_project_id()
+    if not project_id:
+        warn("No project found for repository, issue will not be added to a project")
+    return project_id
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(
         description="Create a GitHub issue from an Epic document"
@@ -433,8 +503,23 @@ def main() -> int:
     parser.add_argument(
         "epic_file",
         type=Path,
+        nargs="?",
         help="Path to the epic.md file"
     )
+    parser.add_argument(
+        "--all",
+        type=Path,
+        nargs="?",
+        const=FEATURES_PATH,
+        metavar="ROOT",
+        help="Publish every unlinked epic.md beneath ROOT (default: docs/features), skipping linked ones"
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=4,
+        help="Number of epics to create concurrently with --all (default: 4)"
+    )
     parser.add_argument(
         "-y", "--yes",
         action="store_true",
@@ -451,8 +536,37 @@ def main() -> int:
         action="store_true",
         help="Skip adding the issue to any project"
     )
+    parser.add_argument(
+        "--with-tasks",
+        action="store_true",
+        help="Also publish the TASK files in the epic's tasks/ folder as sub-issues (reuses an existing epic link)"
+    )
+    parser.add_argument(
+        "--create-missing-labels",
+        action="store_true",
+        help="With --with-tasks, create task labels missing from the repository (default: fail fast)"
+    )
+    parser.add_argument(
+        "--skip-dependencies",
+        action="store_true",
+        help="With --with-tasks, don't rewrite TASK references or create blocked-by relationships"
+    )
 
     args = parser.parse_args()
+    if args.all is not None:
+        if args.epic_file or args.with_tasks:
+            parser.error("--all can't be combined with an epic file or --with-tasks")
+        root = args.all
+        if not root.is_absolute() and not root.exists():
+            root = create_gh_issues.find_project_root(Path.cwd()) / root
+        if not root.is_dir():
+            error(f"Features folder not found: {root}")
+            return 1
+        if not check_prerequisites():
+            return 1
+        return publish_all_epics(root, resolve_project_id(args), args.jobs)
+    if not args.epic_file:
+        parser.error("an epic file or --all is required")
     epic_file: Path = args.epic_file
 
     # Validate epic file exists
@@ -484,9 +598,11 @@ def main() -> int:
         epic_type = "epic"
         warn("No 'type' field in frontmatter, using default label: epic")
 
-    # Check if link already exists
+    # Check if link already exists (publishing tasks resumes with the existing epic)
     existing_link = frontmatter.get("link", "")
-    if existing_link and not args.yes:
+    if existing_link and args.with_tasks:
+        print(f"🔁 Epic already published as {existing_link}, publishing its tasks")
+    elif existing_link and not args.yes:
         warn(f"Epic already has a link: {existing_link}")
         response = input("Do you want to create a new issue anyway? (y/N) ").strip().lower()
         if response != "y":
@@ -501,69 +617,70 @@ def main() -> int:
         error("No content found after frontmatter")
         return 1
 
-    # Resolve project ID
-    project_id = None
-    if not args.no_project:
-        if args.project:
-            # Use explicitly provided project
-            print(f"🔍 Looking up project: {args.project}")
-            project_id = get_project_id_by_name(args.project)
-            if not project_id:
-                warn(f"Project '{args.project}' not found, issue will not be added to a project")
-        else:
-            # Auto-discover from repository
-            print("🔍 Looking for repository project...")
-            project_id = get_repo_project_id()
-            if not project_id:
-                warn("No project found for repository, issue will not be added to a project")
+    task_files: list[Path] = []
+    tasks: dict[Path, tuple[dict, str]] = {}
+    project_root = create_gh_issues.find_project_root(epic_file.parent)
+    if args.with_tasks:
+        task_files, tasks = load_epic_tasks(epic_file)
+        print(f"📂 Found {len(task_files)} task file(s)")
+        # Fail on missing labels before anything is created
+        if tasks and not create_gh_issues.preflight_labels(tasks, project_root, args.create_missing_labels):
+            error("Label preflight failed, no issues were created")
+            return 1
 
-    # Create temp file with body content
-    with tempfile.NamedTemporaryFile(mode="w", suffix=".md", delete=False, encoding="utf-8") as tmp:
-        tmp.write(body)
-        temp_file = Path(tmp.name)
+    project_id = resolve_project_id(args)
 
+    links: dict[Path, str] = {}
     try:
-        print("🚀 Creating GitHub issue...")
-
-        issue_url, issue_num = create_github_issue(epic_title, epic_type, temp_file)
-
-        # Add to project if available
-        if project_id:
-            issue_id = get_issue_id(issue_num)
+        if existing_link and args.with_tasks:
+            issue_num = create_gh_issues.normalize_issue_ref(existing_link)
+            issue_url = None
+        else:
+            issue_url, issue_num, issue_id = create_epic_issue(epic_title, epic_type, body, project_id)
+            # Written back with the task links at the end of the run
+            links[epic_file] = issue_num
+            # The tasks' parent is the epic, so seed its node ID instead of looking it up again
             if issue_id:
-                if add_issue_to_project(project_id, issue_id):
-                    print("📊 Added to project")
-                else:
-                    warn("Failed to add issue to project")
+                create_gh_issues.remember_issue_id(issue_num, issue_id)
 
-        print("📝 Updating epic frontmatter with link...")
-
-        # Update frontmatter with link
-        updated_content = update_frontmatter_with_link(content, issue_num)
-        epic_file.write_text(updated_content, encoding="utf-8")
+        task_success = 0
+        if tasks:
+            print(f"🚀 Publishing {len(task_files)} task(s) under #{issue_num}...")
+            task_success = publish_epic_tasks(
+                task_files, tasks, issue_num, project_id, args.no_project, project_root, links,
+                publish_dependencies=not args.skip_dependencies,
+            )
 
         # Success output
         print()
-        success("GitHub Issue Created")
-        print()
-        print(f"   Issue:  #{issue_num}")
-        print(f"   Title:  {epic_title}")
-        print(f"   Label:  {epic_type}")
-        print(f"   URL:    {issue_url}")
-        if project_id:
-            print("   Project: Added ✓")
+        if issue_url:
+            success("GitHub Issue Created")
+            print()
+            print(f"   Issue:  #{issue_num}")
+            print(f"   Title:  {epic_title}")
+            print(f"   Label:  {epic_type}")
+            print(f"   URL:    {issue_url}")
+            if project_id:
+                print("   Project: Added ✓")
+        else:
+            success(f"Epic #{issue_num}")
+        if args.with_tasks:
+            print(f"   Tasks:  {task_success}/{len(task_files)} published")
         print()
-        print(f'   Epic frontmatter updated with: link: "#{issue_num}"')
+        if issue_url:
+            print(f'   Epic frontmatter updated with: link: "#{issue_num}"')
 
-        return 0
+        return 0 if task_success == len(task_files) else 1
 
     except RuntimeError as e:
         error(str(e))
         return 1
 
     finally:
-        # Cleanup temp file
-        temp_file.unlink(missing_ok=True)
+        # One atomic writeback for every issue created, even if the run stopped early
+        if links:
+            print("📝 Updating frontmatter with links...")
+            write_links(links)
 
 
 if __name__ == "__main__":
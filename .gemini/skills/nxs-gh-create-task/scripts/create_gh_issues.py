@@ -14,8 +14,50 @@ import re
 import subprocess
 import sys
 import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "lib"))
+
+from gh_projects import find_project  # noqa: E402
+from label_registry import load_label_registry  # noqa: E402
+from repo_meta import get_repo_meta  # noqa: E402
+
+
+# Per-thread output buffer, set while an epic is processed by a bulk-mode worker
+_thread_output = threading.local()
+
+# Lookups shared by every task (and every epic in bulk mode) within a run
+_project_id_cache: dict[str, str | None] = {}
+_issue_id_cache: dict[str, str] = {}
+_project_fields_cache: dict[str, dict[str, dict] | None] = {}
+_project_fields_lock = threading.Lock()
+
+# Default mapping of frontmatter keys to GitHub Project custom field names.
+# Override with "projectFields" in docs/system/delivery/config.json.
+PROJECT_FIELD_MAP = {
+    "status": "Status",
+    "effort": "Effort",
+    "category": "Category",
+    "iteration": "Iteration",
+}
+
+# Maximum number of mutations sent in one aliased GraphQL request
+MUTATION_BATCH_SIZE = 50
+
+# Task references as generated by format_dependencies (e.g., "TASK-7.02")
+TASK_REF_PATTERN = re.compile(r"\bTASK-\d+\.\d+\b")
+
+
+def log(message: str = "", error: bool = False) -> None:
+    """Print a message, or buffer it when running inside a bulk-mode worker."""
+    buffer = getattr(_thread_output, "buffer", None)
+    if buffer is not None:
+        buffer.append((message, error))
+    else:
+        print(message, file=sys.stderr if error else sys.stdout)
+
 
 def parse_frontmatter(content: str) -> tuple[dict, str]:
     """Parse YAML frontmatter from markdown content.
@@ -56,13 +98,153 @@ def find_task_files(target_folder: str) -> list[Path]:
     return sorted([Path(f) for f in files])
 
 
+def find_epic_task_folders(root_folder: str) -> dict[Path, list[Path]]:
+    """Find every folder under root_folder that contains TASK-???.md files.
+
+    Returns:
+        Dict of folder path to its sorted task files, ordered by folder path.
+    """
+    folders: dict[Path, list[Path]] = {}
+    for task_file in sorted(Path(root_folder).rglob("TASK-*.md")):
+        folders.setdefault(task_file.parent, []).append(task_file)
+    return folders
+
+
+def load_task_files(task_files: list[Path]) -> dict[Path, tuple[dict, str]]:
+    """Read and parse the frontmatter of every task file in one pass."""
+    return {task_file: parse_frontmatter(task_file.read_text()) for task_file in task_files}
+
+
+def find_project_root(start_path: Path) -> Path:
+    """Find the project root by looking for CLAUDE.md or .git."""
+    current = start_path.resolve()
+
+    while current != current.parent:
+        if (current / "CLAUDE.md").exists() or (current / ".git").exists():
+            return current
+        current = current.parent
+
+    # Fallback to current working directory
+    return Path.cwd()
+
+
+def get_task_labels(frontmatter: dict) -> list[str]:
+    """Return the frontmatter labels as a list (a bare string becomes one label)."""
+    labels = frontmatter.get("labels", [])
+    if isinstance(labels, str):
+        labels = [labels] if labels else []
+    return labels
+
+
+def fetch_repo_labels() -> set[str] | None:
+    """Fetch every label name defined in the current repository.
+
+    Uses a single paginated REST call rather than one lookup per label.
+
+    Returns:
+        Set of lowercase label names, or None if the labels could not be fetched.
+    """
+    cmd = [
+        "gh", "api", "--paginate",
+        "repos/{owner}/{repo}/labels?per_page=100",
+        "--jq", ".[].name"
+    ]
+
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+    except subprocess.CalledProcessError as e:
+        log(f"Error fetching repository labels: {e.stderr}", error=True)
+        return None
+
+    return {line.strip().lower() for line in result.stdout.splitlines() if line.strip()}
+
+
+def create_repo_label(name: str, color: str | None = None) -> bool:
+    """Create a label in the current repository.
+
+    Returns:
+        True if successful, False otherwise.
+    """
+    cmd = ["gh", "label", "create", name, "--force"]
+    if color:
+        cmd.extend(["--color", color])
+
+    try:
+        subprocess.run(cmd, capture_output=True, text=True, check=True)
+        return True
+    except subprocess.CalledProcessError as e:
+        log(f"Error creating label '{name}': {e.stderr}", error=True)
+        return False
+
+
+def preflight_labels(tasks: dict[Path, tuple[dict, str]], project_root: Path, create_missing: bool = False) -> bool:
+    """Make sure every label the run needs exists before any issue is created.
+
+    Diffs the labels used by the task files and documented in task-labels.md
+    against the repository's labels. Missing labels are either provisioned
+    up front (``create_missing``) or reported so the run fails fast.
+
+    Returns:
+        True if issue creation can proceed, False otherwise.
+    """
+    used_by: dict[str, list[str]] = {}
+    for task_file, (frontmatter, _) in tasks.items():
+        for label in get_task_labels(frontmatter):
+            used_by.setdefault(label.lower(), []).append(task_file.name)
+
+    catalog = load_label_registry(project_root)
+    if not used_by and not len(catalog):
+        return True
+
+    log("Checking repository labels...")
+    repo_labels = fetch_repo_labels()
+    if repo_labels is None:
+        return False
+
+    missing_used = sorted(label for label in used_by if label not in repo_labels)
+    missing_catalog = sorted(label for label in catalog.names if label not in repo_labels and label not in used_by)
+
+    if not missing_used and not missing_catalog:
+        log(f"All {len(used_by)} label(s) used by tasks exist")
+        return True
+
+    if create_missing:
+        failed = []
+        for label in missing_used + missing_catalog:
+            if create_repo_label(label, catalog.color(label)):
+                log(f"  Created label: {label}")
+            else:
+                failed.append(label)
+        if failed:
+            log(f"Error: Could not create label(s): {', '.join(failed)}", error=True)
+            # Only labels that tasks actually use block issue creation
+            return not any(label in used_by for label in failed)
+        return True
+
+    for label in missing_catalog:
+        log(f"  Warning: Label '{label}' from task-labels.md does not exist in the repository", error=True)
+
+    if missing_used:
+        log("Error: The following labels do not exist in the repository:", error=True)
+        for label in missing_used:
+            suggestions = catalog.suggest(label) if label not in catalog else []
+            hint = f", did you mean {' or '.join(suggestions)}?" if suggestions else ""
+            log(f"  {label} (used by {', '.join(used_by[label])}{hint})", error=True)
+        log("Re-run with --create-missing-labels to create them", error=True)
+        return False
+
+    return True
+
+
 def get_project_id_by_name(project_name: str) -> str | None:
     """Get the node ID of a project by its name.
     
     The project_name can be in format:
     - "owner/project-number" (e.g., "my-org/1")
-    - "project-number" (uses current repo's owner)
-    - "project-title" (searches by title)
+    - "owner/project-title"
+    - "project-number" or "project-title" (uses current repo's owner)
+
+    Titles must match exactly (case-insensitive).
     
     Args:
         project_name: The project identifier
@@ -70,255 +252,405 @@ def get_project_id_by_name(project_name: str) -> str | None:
     Returns:
         The project node ID (e.g., "PVT_kwHOABC123") or None if not found.
     """
-    # Parse project name to extract owner and number/title
-    if "/" in project_name:
-        owner, project_ref = project_name.rsplit("/", 1)
-    else:
-        # Get owner from current repo
-        try:
-            result = subprocess.run(
-                ["gh", "repo", "view", "--json", "owner", "--jq", ".owner.login"],
-                capture_output=True, text=True, check=True
-            )
-            owner = result.stdout.strip()
-            project_ref = project_name
-        except subprocess.CalledProcessError as e:
-            print(f"Error getting repo owner: {e.stderr}", file=sys.stderr)
-            return None
+    if project_name in _project_id_cache:
+        return _project_id_cache[project_name]
 
-    # Try to parse as a number for project lookup
+    project_id = _lookup_project_id(project_name)
+    _project_id_cache[project_name] = project_id
+    return project_id
+
+
+def _lookup_project_id(project_name: str) -> str | None:
+    """Resolve a project identifier to its node ID (uncached)."""
     try:
-        project_number = int(project_ref)
-        return get_project_id_by_number(owner, project_number)
-    except ValueError:
-        # Not a number, try to find project by title
-        return get_project_id_by_title(owner, project_ref)
+        project = find_project(project_name)
+    except RuntimeError as e:
+        log(f"Error looking up project '{project_name}': {e}", error=True)
+        return None
+
+    if not project:
+        return None
+    log(f"Found project: {project.get('title', 'Unknown')}")
+    return project.get("id")
 
 
-def get_project_id_by_number(owner: str, project_number: int) -> str | None:
-    """Get the node ID of a project by owner and number.
+def get_repo_project_id() -> str | None:
+    """Get the node ID of the first project associated with the current repository.
+    
+    Comes from the shared repository metadata cache (.tmp/repo-meta.json).
     
-    Args:
-        owner: The organization or user login
-        project_number: The project number
-        
     Returns:
-        The project node ID or None if not found.
-    """
-    # Query for project by number (try org first)
-    query = """
-    query($owner: String!, $number: Int!) {
-        organization(login: $owner) {
-            projectV2(number: $number) {
-                id
-                title
-            }
-        }
-    }
+        The project node ID (e.g., "PVT_kwHOABC123") or None if no project found.
     """
+    try:
+        project = get_repo_meta()["project"]
+    except RuntimeError as e:
+        log(f"Error fetching repository projects: {e}", error=True)
+        return None
     
-    cmd = [
-        "gh", "api", "graphql",
-        "-f", f"query={query}",
-        "-f", f"owner={owner}",
-        "-F", f"number={project_number}"
-    ]
+    if not project:
+        return None
+    log(f"Found project: {project.get('title', 'Unknown')}")
+    return project.get("id")
+
+
+def add_issue_to_project(project_id: str, issue_id: str) -> str | None:
+    """Add an issue to a project using the GraphQL API.
     
-    try:
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        data = json.loads(result.stdout)
-        project = data.get("data", {}).get("organization", {}).get("projectV2")
-        if project:
-            print(f"Found project: {project.get('title', 'Unknown')}")
-            return project.get("id")
-    except (subprocess.CalledProcessError, json.JSONDecodeError):
-        pass  # Try user query below
-    
-    # If org query fails, try user query
-    query = """
-    query($owner: String!, $number: Int!) {
-        user(login: $owner) {
-            projectV2(number: $number) {
+    Args:
+        project_id: The project's node ID (e.g., "PVT_kwHOABC123")
+        issue_id: The issue's node ID (e.g., "I_kwDOABC123")
+        
+    Returns:
+        The project item's node ID if successful, None otherwise.
+    """
+    mutation = f"""
+    mutation {{
+        addProjectV2ItemById(input: {{
+            projectId: "{project_id}",
+            contentId: "{issue_id}"
+        }}) {{
+            item {{
                 id
-                title
-            }
-        }
-    }
+            }}
+        }}
+    }}
     """
     
-    cmd = [
-        "gh", "api", "graphql",
-        "-f", f"query={query}",
-        "-f", f"owner={owner}",
-        "-F", f"number={project_number}"
-    ]
+    cmd = ["gh", "api", "graphql", "-f", f"query={mutation}"]
     
     try:
         result = subprocess.run(cmd, capture_output=True, text=True, check=True)
         data = json.loads(result.stdout)
-        project = data.get("data", {}).get("user", {}).get("projectV2")
-        if project:
-            print(f"Found project: {project.get('title', 'Unknown')}")
-            return project.get("id")
-    except (subprocess.CalledProcessError, json.JSONDecodeError) as e:
-        print(f"Error fetching project by number: {e}", file=sys.stderr)
+        return data["data"]["addProjectV2ItemById"]["item"]["id"]
+    except subprocess.CalledProcessError as e:
+        log(f"Error adding issue to project: {e.stderr}", error=True)
+        return None
+    except (json.JSONDecodeError, KeyError, TypeError) as e:
+        log(f"Error parsing add-to-project response: {e}", error=True)
+        return None
+
+
+def load_project_field_map(project_root: Path) -> dict[str, str]:
+    """Load the frontmatter key -> project field name mapping.
     
-    return None
+    Uses "projectFields" from docs/system/delivery/config.json when present,
+    otherwise PROJECT_FIELD_MAP.
+    """
+    config_path = project_root / "docs" / "system" / "delivery" / "config.json"
+    if config_path.exists():
+        try:
+            config = json.loads(config_path.read_text())
+        except json.JSONDecodeError as e:
+            log(f"Warning: Invalid JSON in {config_path}: {e}", error=True)
+            return PROJECT_FIELD_MAP
+        field_map = config.get("projectFields")
+        if isinstance(field_map, dict):
+            return {key.lower(): name for key, name in field_map.items()}
+    return PROJECT_FIELD_MAP
 
 
-def get_project_id_by_title(owner: str, title: str) -> str | None:
-    """Get the node ID of a project by searching for its title.
+def get_project_fields(project_id: str) -> dict[str, dict] | None:
+    """Get a project's fields (with option and iteration IDs), fetched once per run.
     
     Args:
-        owner: The organization or user login
-        title: The project title to search for
+        project_id: The project's node ID
         
     Returns:
-        The project node ID or None if not found.
-    """
-    # Try org first
-    query = """
-    query($owner: String!, $title: String!) {
-        organization(login: $owner) {
-            projectsV2(first: 100, query: $title) {
-                nodes {
-                    id
-                    title
-                }
-            }
-        }
-    }
+        Dict of lowercase field name to {"id", "type", "options"}, where
+        options maps lowercase option/iteration title to its ID.
+        None if the fields could not be fetched.
     """
-    
-    cmd = [
-        "gh", "api", "graphql",
-        "-f", f"query={query}",
-        "-f", f"owner={owner}",
-        "-f", f"title={title}"
-    ]
-    
-    nodes = []
-    try:
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        data = json.loads(result.stdout)
-        nodes = data.get("data", {}).get("organization", {}).get("projectsV2", {}).get("nodes", [])
-    except (subprocess.CalledProcessError, json.JSONDecodeError):
-        pass  # Try user query below
-    
-    # If org query fails or returns no results, try user query
-    if not nodes:
+    with _project_fields_lock:
+        if project_id in _project_fields_cache:
+            return _project_fields_cache[project_id]
+        
         query = """
-        query($owner: String!, $title: String!) {
-            user(login: $owner) {
-                projectsV2(first: 100, query: $title) {
-                    nodes {
-                        id
-                        title
+        query($project: ID!) {
+            node(id: $project) {
+                ... on ProjectV2 {
+                    fields(first: 100) {
+                        nodes {
+                            ... on ProjectV2FieldCommon {
+                                id
+                                name
+                                dataType
+                            }
+                            ... on ProjectV2SingleSelectField {
+                                options { id name }
+                            }
+                            ... on ProjectV2IterationField {
+                                configuration {
+                                    iterations { id title }
+                                    completedIterations { id title }
+                                }
+                            }
+                        }
                     }
                 }
             }
         }
         """
         
-        cmd = [
-            "gh", "api", "graphql",
-            "-f", f"query={query}",
-            "-f", f"owner={owner}",
-            "-f", f"title={title}"
-        ]
+        cmd = ["gh", "api", "graphql", "-f", f"query={query}", "-f", f"project={project_id}"]
         
+        fields: dict[str, dict] | None = None
         try:
             result = subprocess.run(cmd, capture_output=True, text=True, check=True)
             data = json.loads(result.stdout)
-            nodes = data.get("data", {}).get("user", {}).get("projectsV2", {}).get("nodes", [])
-        except (subprocess.CalledProcessError, json.JSONDecodeError) as e:
-            print(f"Error searching for project by title: {e}", file=sys.stderr)
+            nodes = (data.get("data", {}).get("node") or {}).get("fields", {}).get("nodes", [])
+            fields = {}
+            for node in nodes:
+                if not node.get("id"):
+                    continue
+                options = {option["name"].lower(): option["id"] for option in node.get("options", [])}
+                configuration = node.get("configuration") or {}
+                for iteration in configuration.get("iterations", []) + configuration.get("completedIterations", []):
+                    options[iteration["title"].lower()] = iteration["id"]
+                fields[node["name"].lower()] = {
+                    "id": node["id"],
+                    "type": node.get("dataType", ""),
+                    "options": options,
+                }
+        except subprocess.CalledProcessError as e:
+            log(f"Error fetching project fields: {e.stderr}", error=True)
+        except json.JSONDecodeError as e:
+            log(f"Error parsing project fields response: {e}", error=True)
+        
+        _project_fields_cache[project_id] = fields
+        return fields
+
+
+def build_field_value(field: dict, raw_value: str) -> str | None:
+    """Build the GraphQL value literal for a project field.
+    
+    Returns:
+        The ProjectV2FieldValue input literal, or None if the value doesn't
+        fit the field (e.g., unknown single-select option).
+    """
+    field_type = field["type"]
+    if field_type in ("SINGLE_SELECT", "ITERATION"):
+        option_id = field["options"].get(raw_value.lower())
+        if not option_id:
+            return None
+        key = "singleSelectOptionId" if field_type == "SINGLE_SELECT" else "iterationId"
+        return f"{{{key}: {json.dumps(option_id)}}}"
+    if field_type == "NUMBER":
+        try:
+            return f"{{number: {float(raw_value)}}}"
+        except ValueError:
             return None
+    if field_type == "DATE":
+        return f"{{date: {json.dumps(raw_value)}}}"
+    if field_type == "TEXT":
+        return f"{{text: {json.dumps(raw_value)}}}"
+    return None
+
+
+def collect_field_updates(
+    project_id: str,
+    item_id: str,
+    frontmatter: dict,
+    field_map: dict[str, str],
+) -> list[tuple[str, str, str, str]]:
+    """Map a task's frontmatter to pending project field updates.
     
-    if not nodes:
-        return None
+    Frontmatter keys without a matching project field (or with a value the
+    field doesn't accept) are skipped with a warning.
     
-    # Find exact match first
-    for node in nodes:
-        if node.get("title", "").lower() == title.lower():
-            print(f"Found project: {node.get('title', 'Unknown')}")
-            return node.get("id")
+    Returns:
+        List of (project_id, item_id, field_id, value_literal) tuples.
+    """
+    fields = get_project_fields(project_id)
+    if not fields:
+        return []
     
-    # If no exact match, use first result
-    project = nodes[0]
-    print(f"Found project: {project.get('title', 'Unknown')}")
-    return project.get("id")
+    updates = []
+    for key, field_name in field_map.items():
+        raw_value = frontmatter.get(key)
+        if not raw_value or not isinstance(raw_value, str):
+            continue
+        field = fields.get(field_name.lower())
+        if not field:
+            continue
+        value = build_field_value(field, raw_value)
+        if value is None:
+            log(f"  Warning: '{raw_value}' is not a valid value for project field '{field_name}'", error=True)
+            continue
+        updates.append((project_id, item_id, field["id"], value))
+    return updates
 
 
-def get_repo_project_id() -> str | None:
-    """Get the node ID of the first project associated with the current repository.
+def run_batched_mutations(mutations: list[str], description: str, headers: list[str] | None = None) -> int:
+    """Send mutations as aliased GraphQL requests of MUTATION_BATCH_SIZE each.
     
+    The request is passed on stdin, so large payloads (e.g., issue bodies)
+    aren't limited by the command-line length.
+    
+    Args:
+        mutations: Mutation selections without alias (e.g., "addBlockedBy(...) { ... }")
+        description: What the mutations do, for error messages
+        headers: Extra HTTP headers for gh api (e.g., "GraphQL-Features: sub_issues")
+        
     Returns:
-        The project node ID (e.g., "PVT_kwHOABC123") or None if no project found.
+        Number of mutations that succeeded.
     """
-    query = """
-    query {
-        repository(owner: "{owner}", name: "{repo}") {
-            projectsV2(first: 1) {
-                nodes {
-                    id
-                    title
-                }
-            }
-        }
-    }
+    succeeded = 0
+    for start in range(0, len(mutations), MUTATION_BATCH_SIZE):
+        batch = mutations[start:start + MUTATION_BATCH_SIZE]
+        query = "mutation { " + " ".join(f"m{i}: {mutation}" for i, mutation in enumerate(batch)) + " }"
+        
+        cmd = ["gh", "api", "graphql", "--input", "-"]
+        for header in headers or []:
+            cmd.extend(["-H", header])
+        
+        # A failing alias doesn't fail the others, so count per alias
+        result = subprocess.run(cmd, input=json.dumps({"query": query}), capture_output=True, text=True)
+        try:
+            response = json.loads(result.stdout)
+        except json.JSONDecodeError:
+            log(f"Error {description}: {result.stderr}", error=True)
+            continue
+        
+        data = response.get("data") or {}
+        succeeded += sum(1 for i in range(len(batch)) if data.get(f"m{i}"))
+        for err in response.get("errors", []):
+            log(f"Error {description}: {err.get('message', err)}", error=True)
+    return succeeded
+
+
+def update_project_fields(updates: list[tuple[str, str, str, str]]) -> int:
+    """Apply project field updates as aliased updateProjectV2ItemFieldValue mutations.
+    
+    Returns:
+        Number of field values updated.
     """
+    mutations = [
+        f"updateProjectV2ItemFieldValue(input: {{"
+        f"projectId: {json.dumps(project_id)}, itemId: {json.dumps(item_id)}, "
+        f"fieldId: {json.dumps(field_id)}, value: {value}"
+        f"}}) {{ projectV2Item {{ id }} }}"
+        for project_id, item_id, field_id, value in updates
+    ]
+    return run_batched_mutations(mutations, "updating project fields")
+
+
+def load_linked_tasks(tasks: dict[Path, tuple[dict, str]]) -> dict[str, str]:
+    """Map task IDs to issue numbers for tasks that already have a frontmatter link."""
+    linked: dict[str, str] = {}
+    for task_file, (frontmatter, _) in tasks.items():
+        link = frontmatter.get("link", "")
+        task_id = get_task_id(task_file, frontmatter)
+        if link and task_id:
+            number = normalize_issue_ref(link)
+            if number.isdigit():
+                linked[task_id] = number
+    return linked
+
+
+def get_task_id(task_file: Path, frontmatter: dict) -> str | None:
+    """Get the task ID (e.g., "TASK-7.02") from the title or file name."""
+    for candidate in (frontmatter.get("title", ""), task_file.stem):
+        match = TASK_REF_PATTERN.match(candidate)
+        if match:
+            return match.group(0)
+    return None
+
+
+def resolve_issue_ids(issue_numbers: list[str]) -> dict[str, str]:
+    """Resolve many issue numbers to node IDs with one aliased query.
     
-    cmd = ["gh", "api", "graphql", "-f", f"query={query}"]
+    Already known IDs come from the run's cache; only the rest are queried.
     
-    try:
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        data = json.loads(result.stdout)
-        nodes = data.get("data", {}).get("repository", {}).get("projectsV2", {}).get("nodes", [])
-        if nodes:
-            project = nodes[0]
-            print(f"Found project: {project.get('title', 'Unknown')}")
-            return project.get("id")
-        return None
-    except subprocess.CalledProcessError as e:
-        print(f"Error fetching repository projects: {e.stderr}", file=sys.stderr)
-        return None
-    except json.JSONDecodeError as e:
-        print(f"Error parsing project response: {e}", file=sys.stderr)
-        return None
+    Returns:
+        Dict of issue number to node ID for every issue that was found.
+    """
+    missing = sorted({n for n in issue_numbers if n not in _issue_id_cache}, key=int)
+    if missing:
+        selections = " ".join(f"i{n}: issue(number: {int(n)}) {{ id }}" for n in missing)
+        query = f"query($owner: String!, $repo: String!) {{ repository(owner: $owner, name: $repo) {{ {selections} }} }}"
+        cmd = [
+            "gh", "api", "graphql",
+            "-F", "owner={owner}",
+            "-F", "repo={repo}",
+            "-f", f"query={query}"
+        ]
+        result = subprocess.run(cmd, capture_output=True, text=True)
+        try:
+            repository = (json.loads(result.stdout).get("data") or {}).get("repository") or {}
+        except json.JSONDecodeError:
+            log(f"Error resolving issue IDs: {result.stderr}", error=True)
+            repository = {}
+        for n in missing:
+            issue = repository.get(f"i{n}")
+            if issue:
+                _issue_id_cache[n] = issue["id"]
+    
+    return {n: _issue_id_cache[n] for n in issue_numbers if n in _issue_id_cache}
 
 
-def add_issue_to_project(project_id: str, issue_id: str) -> bool:
-    """Add an issue to a project using the GraphQL API.
+def rewrite_task_refs(body: str, task_issues: dict[str, str]) -> str:
+    """Replace TASK-x.yy references to known tasks with their issue (#123)."""
+    return TASK_REF_PATTERN.sub(
+        lambda m: f"#{task_issues[m.group(0)]}" if m.group(0) in task_issues else m.group(0),
+        body,
+    )
+
+
+def publish_task_dependencies(
+    created_tasks: dict[str, tuple[str, str]],
+    task_issues: dict[str, str],
+) -> tuple[int, int]:
+    """Rewrite TASK references to issue numbers and add blocked-by relationships.
+    
+    Runs once at the end, when every task has an issue number: node IDs are
+    resolved in one query and all body updates and addBlockedBy mutations
+    are sent as batched aliased mutations.
     
     Args:
-        project_id: The project's node ID (e.g., "PVT_kwHOABC123")
-        issue_id: The issue's node ID (e.g., "I_kwDOABC123")
+        created_tasks: Task ID -> (issue number, body) for issues created in this run
+        task_issues: Task ID -> issue number for every known task
         
     Returns:
-        True if successful, False otherwise.
-    """
-    mutation = f"""
-    mutation {{
-        addProjectV2ItemById(input: {{
-            projectId: "{project_id}",
-            contentId: "{issue_id}"
-        }}) {{
-            item {{
-                id
-            }}
-        }}
-    }}
+        Tuple of (bodies updated, dependencies added)
     """
+    body_updates: list[tuple[str, str]] = []
+    dependencies: list[tuple[str, str]] = []
     
-    cmd = ["gh", "api", "graphql", "-f", f"query={mutation}"]
+    for task_id, (issue_number, body) in created_tasks.items():
+        rewritten = rewrite_task_refs(body, task_issues)
+        if rewritten != body:
+            body_updates.append((issue_number, rewritten))
+        
+        blocked_by = re.search(r"Blocked by:\s*(.*)", body)
+        if blocked_by:
+            for ref in TASK_REF_PATTERN.findall(blocked_by.group(1)):
+                if ref in task_issues and ref != task_id:
+                    dependencies.append((issue_number, task_issues[ref]))
+                elif ref not in task_issues:
+                    log(f"  Warning: {task_id} is blocked by unknown task {ref}", error=True)
     
-    try:
-        subprocess.run(cmd, capture_output=True, text=True, check=True)
-        return True
-    except subprocess.CalledProcessError as e:
-        print(f"Error adding issue to project: {e.stderr}", file=sys.stderr)
-        return False
+    if not body_updates and not dependencies:
+        return 0, 0
+    
+    numbers = [n for n, _ in body_updates] + [n for pair in dependencies for n in pair]
+    node_ids = resolve_issue_ids(numbers)
+    
+    body_mutations = [
+        f"updateIssue(input: {{id: {json.dumps(node_ids[n])}, body: {json.dumps(body)}}}) {{ issue {{ number }} }}"
+        for n, body in body_updates
+        if n in node_ids
+    ]
+    dependency_mutations = [
+        f"addBlockedBy(input: {{issueId: {json.dumps(node_ids[child])}, "
+        f"blockingIssueId: {json.dumps(node_ids[blocker])}}}) {{ issue {{ number }} }}"
+        for child, blocker in dependencies
+        if child in node_ids and blocker in node_ids
+    ]
+    
+    bodies_updated = run_batched_mutations(body_mutations, "rewriting task references")
+    dependencies_added = run_batched_mutations(dependency_mutations, "adding blocked-by relationships")
+    return bodies_updated, dependencies_added
 
 
 def create_github_issue(title: str, labels: list[str], body_file: str) -> str | None:
@@ -338,7 +670,7 @@ def create_github_issue(title: str, labels: list[str], body_file: str) -> str |
         issue_url = result.stdout.strip()
         return issue_url
     except subprocess.CalledProcessError as e:
-        print(f"Error creating issue: {e.stderr}", file=sys.stderr)
+        log(f"Error creating issue: {e.stderr}", error=True)
         return None
 
 
@@ -350,6 +682,23 @@ def extract_issue_number(issue_url: str) -> str | None:
     return None
 
 
+def normalize_issue_ref(issue_ref: str) -> str:
+    """Extract the issue number from a number, #number, or full issue URL."""
+    issue_number = issue_ref
+    if issue_ref.startswith("#"):
+        issue_number = issue_ref[1:]
+    elif "/issues/" in issue_ref:
+        match = re.search(r"/issues/(\d+)", issue_ref)
+        if match:
+            issue_number = match.group(1)
+    return issue_number
+
+
+def remember_issue_id(issue_ref: str, issue_id: str) -> None:
+    """Seed the issue ID cache, e.g. with a parent issue the caller just created."""
+    _issue_id_cache[normalize_issue_ref(issue_ref)] = issue_id
+
+
 def get_issue_id(issue_ref: str) -> str | None:
     """Get the GitHub GraphQL node ID for an issue.
     
@@ -359,22 +708,20 @@ def get_issue_id(issue_ref: str) -> str | None:
     Returns:
         The GraphQL node ID (e.g., "I_kwDOABC123") or None if not found.
     """
-    # Extract issue number from various formats
-    issue_number = issue_ref
-    if issue_ref.startswith("#"):
-        issue_number = issue_ref[1:]
-    elif "/issues/" in issue_ref:
-        match = re.search(r"/issues/(\d+)", issue_ref)
-        if match:
-            issue_number = match.group(1)
+    issue_number = normalize_issue_ref(issue_ref)
+    
+    if issue_number in _issue_id_cache:
+        return _issue_id_cache[issue_number]
     
     cmd = ["gh", "issue", "view", issue_number, "--json", "id", "--jq", ".id"]
     
     try:
         result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        return result.stdout.strip()
+        issue_id = result.stdout.strip()
+        _issue_id_cache[issue_number] = issue_id
+        return issue_id
     except subprocess.CalledProcessError as e:
-        print(f"Error getting issue ID for {issue_ref}: {e.stderr}", file=sys.stderr)
+        log(f"Error getting issue ID for {issue_ref}: {e.stderr}", error=True)
         return None
 
 
@@ -388,7 +735,7 @@ def assign_parent_issue(child_issue_number: str, parent_issue_ref: str) -> bool:
     child_id = get_issue_id(child_issue_number)
     
     if not parent_id or not child_id:
-        print(f"Error: Could not resolve issue IDs (parent={parent_id}, child={child_id})", file=sys.stderr)
+        log(f"Error: Could not resolve issue IDs (parent={parent_id}, child={child_id})", error=True)
         return False
     
     # GraphQL mutation to add sub-issue relationship
@@ -414,7 +761,7 @@ def assign_parent_issue(child_issue_number: str, parent_issue_ref: str) -> bool:
         subprocess.run(cmd, capture_output=True, text=True, check=True)
         return True
     except subprocess.CalledProcessError as e:
-        print(f"Error creating sub-issue relationship: {e.stderr}", file=sys.stderr)
+        log(f"Error creating sub-issue relationship: {e.stderr}", error=True)
         return False
 
 
@@ -432,40 +779,251 @@ def resolve_project_id(project_attr: str | None, repo_project_id: str | None) ->
         # Use explicitly specified project from frontmatter
         project_id = get_project_id_by_name(project_attr)
         if not project_id:
-            print(f"  Warning: Project '{project_attr}' not found", file=sys.stderr)
+            log(f"  Warning: Project '{project_attr}' not found", error=True)
         return project_id
     else:
         # Fall back to repo project
         return repo_project_id
 
 
-def process_task_file(task_file: Path, repo_project_id: str | None = None, skip_project: bool = False) -> bool:
+def fetch_linked_issues(parents: list[str], title_prefixes: list[str]) -> dict | None:
+    """Fetch the issues already linked to the given epics in a single query.
+    
+    Sub-issues of every parent and a title search for every prefix (used for
+    tasks without a parent) are requested as aliases of one GraphQL query.
+    
+    Args:
+        parents: Parent issue numbers
+        title_prefixes: Title prefixes to search for (e.g., "TASK-7.")
+        
+    Returns:
+        Dict with "parents" (parent number -> list of issues) and "search"
+        (list of issues), or None if the query failed.
+    """
+    issue_fields = "number title body url state labels(first: 50) { nodes { name } }"
+    
+    selections = []
+    variables = []
+    cmd = ["gh", "api", "graphql", "-H", "GraphQL-Features: sub_issues"]
+    
+    # GitHub rejects declared but unused variables, so $owner/$repo only come with the repository selection
+    if parents:
+        issue_selections = [
+            f"p{i}: issue(number: {int(parent)}) {{ subIssues(first: 100) {{ nodes {{ {issue_fields} }} }} }}"
+            for i, parent in enumerate(parents)
+        ]
+        variables.extend(["$owner: String!", "$repo: String!"])
+        cmd.extend(["-F", "owner={owner}", "-F", "repo={repo}"])
+        selections.append(f"repository(owner: $owner, name: $repo) {{ {' '.join(issue_selections)} }}")
+    
+    for i, prefix in enumerate(title_prefixes):
+        variables.append(f"$q{i}: String!")
+        selections.append(
+            f"s{i}: search(type: ISSUE, first: 100, query: $q{i}) {{ nodes {{ ... on Issue {{ {issue_fields} }} }} }}"
+        )
+        # -F (not -f) so gh fills in the {owner}/{repo} placeholders
+        cmd.extend(["-F", f'q{i}=repo:{{owner}}/{{repo}} is:issue in:title "{prefix}"'])
+    
+    if not selections:
+        return {"parents": {}, "search": []}
+    
+    query = f"query({', '.join(variables)}) {{ {' '.join(selections)} }}"
+    cmd.extend(["-f", f"query={query}"])
+    
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        data = json.loads(result.stdout).get("data") or {}
+    except subprocess.CalledProcessError as e:
+        log(f"Error fetching linked issues: {e.stderr}", error=True)
+        return None
+    except json.JSONDecodeError as e:
+        log(f"Error parsing linked issues response: {e}", error=True)
+        return None
+    
+    repository = data.get("repository") or {}
+    linked: dict = {"parents": {}, "search": []}
+    for i, parent in enumerate(parents):
+        issue = repository.get(f"p{i}") or {}
+        linked["parents"][parent] = (issue.get("subIssues") or {}).get("nodes", [])
+    for i in range(len(title_prefixes)):
+        nodes = (data.get(f"s{i}") or {}).get("nodes", [])
+        linked["search"].extend(node for node in nodes if node)
+    
+    return linked
+
+
+def fetch_existing_issues(tasks: dict[Path, tuple[dict, str]]) -> tuple[dict[Path, dict], dict] | None:
+    """Match each task file to the issue already created for it, in one query.
+    
+    A task matches an issue with the same title (case-insensitive) among
+    its parent's sub-issues or, for tasks without a parent, among the
+    issues whose title starts with the task's "TASK-<epic>." prefix.
+    
+    Returns:
+        Tuple of (task file -> matched issue, fetch_linked_issues result),
+        or None if the remote state could not be fetched.
+    """
+    parents: list[str] = []
+    title_prefixes: list[str] = []
+    for task_file, (frontmatter, _) in tasks.items():
+        parent = frontmatter.get("parent", "")
+        if parent:
+            number = normalize_issue_ref(parent)
+            if number.isdigit() and number not in parents:
+                parents.append(number)
+        else:
+            match = re.match(r"(TASK-\d+\.)", frontmatter.get("title", ""))
+            if match and match.group(1) not in title_prefixes:
+                title_prefixes.append(match.group(1))
+    
+    linked = fetch_linked_issues(parents, title_prefixes)
+    if linked is None:
+        return None
+    
+    def title_key(title: str) -> str:
+        return title.strip().lower()
+    
+    searched = {title_key(issue["title"]): issue for issue in linked["search"]}
+    existing: dict[Path, dict] = {}
+    for task_file, (frontmatter, _) in tasks.items():
+        title = frontmatter.get("title", "") or task_file.stem
+        parent = normalize_issue_ref(frontmatter.get("parent", ""))
+        candidates = {title_key(issue["title"]): issue for issue in linked["parents"].get(parent, [])}
+        issue = candidates.get(title_key(title)) or searched.get(title_key(title))
+        if issue:
+            existing[task_file] = issue
+    return existing, linked
+
+
+def known_task_issues(tasks: dict[Path, tuple[dict, str]], existing: dict[Path, dict]) -> dict[str, str]:
+    """Map task IDs to issue numbers from frontmatter links and title-matched issues."""
+    task_issues = load_linked_tasks(tasks)
+    for task_file, issue in existing.items():
+        task_id = get_task_id(task_file, tasks[task_file][0])
+        if task_id:
+            task_issues[task_id] = str(issue["number"])
+    return task_issues
+
+
+def build_sync_plan(tasks: dict[Path, tuple[dict, str]], base_folder: str) -> dict | None:
+    """Diff local task files against the issues already on GitHub.
+    
+    Each task is classified as "create" (no matching issue), "update" (an
+    issue with the same title exists but its body or labels differ), or
+    "skip" (already in sync). Sub-issues of a parent that no local task
+    matches are reported as "orphan".
+    
+    Returns:
+        The plan dict, or None if the remote state could not be fetched.
+    """
+    fetched = fetch_existing_issues(tasks)
+    if fetched is None:
+        return None
+    existing, linked = fetched
+    
+    # Published bodies have their TASK references rewritten to issue numbers
+    task_issues = known_task_issues(tasks, existing)
+    
+    matched: set[int] = set()
+    entries: list[dict] = []
+    
+    for task_file, (frontmatter, body) in tasks.items():
+        title = frontmatter.get("title", "") or task_file.stem
+        labels = get_task_labels(frontmatter)
+        entry = {
+            "action": "create",
+            "file": os.path.relpath(task_file, base_folder),
+            "title": title,
+        }
+        
+        issue = existing.get(task_file)
+        if not issue:
+            entries.append(entry)
+            continue
+        
+        matched.add(issue["number"])
+        changes = []
+        if (issue.get("body") or "").strip() != rewrite_task_refs(body, task_issues).strip():
+            changes.append("body")
+        remote_labels = {node["name"].lower() for node in (issue.get("labels") or {}).get("nodes", [])}
+        if remote_labels != {label.lower() for label in labels}:
+            changes.append("labels")
+        
+        entry["action"] = "update" if changes else "skip"
+        entry["issue"] = issue["number"]
+        entry["url"] = issue.get("url", "")
+        if changes:
+            entry["changes"] = changes
+        entries.append(entry)
+    
+    for parent, issues in linked["parents"].items():
+        for issue in issues:
+            if issue["number"] not in matched:
+                entries.append({
+                    "action": "orphan",
+                    "title": issue["title"],
+                    "issue": issue["number"],
+                    "url": issue.get("url", ""),
+                    "state": issue.get("state", ""),
+                    "parent": f"#{parent}",
+                })
+    
+    summary = {action: 0 for action in ("create", "update", "skip", "orphan")}
+    for entry in entries:
+        summary[entry["action"]] += 1
+    
+    return {"status": "success", "summary": summary, "plan": entries}
+
+
+def process_task_file(
+    task_file: Path,
+    repo_project_id: str | None = None,
+    skip_project: bool = False,
+    parsed: tuple[dict, str] | None = None,
+    field_map: dict[str, str] | None = None,
+    field_updates: list[tuple[str, str, str, str]] | None = None,
+    created_tasks: dict[str, tuple[str, str]] | None = None,
+    existing_issue: dict | None = None,
+) -> bool:
     """Process a single TASK file and create a GitHub issue.
     
     Args:
         task_file: Path to the TASK-???.md file
         repo_project_id: Fallback project node ID from repository (used if frontmatter has no project)
         skip_project: If True, skip adding to any project
+        parsed: Already parsed (frontmatter, body), to avoid re-reading the file
+        field_map: Frontmatter key -> project field name mapping
+        field_updates: Collects pending project field updates, applied in one
+            batch by the caller
+        created_tasks: Collects task ID -> (issue number, body) for the
+            dependency pass at the end of the run
+        existing_issue: The issue already created for this task (matched by
+            title, as in --plan), if any; the task is then skipped
     
     Returns:
         True if successful, False otherwise.
     """
-    print(f"Processing: {task_file}")
+    log(f"Processing: {task_file}")
     
-    content = task_file.read_text()
-    frontmatter, body = parse_frontmatter(content)
+    if parsed is None:
+        parsed = parse_frontmatter(task_file.read_text())
+    frontmatter, body = parsed
+    
+    link = frontmatter.get("link", "")
+    if link:
+        log(f"  Already published as {link}, skipping")
+        return True
+    if existing_issue:
+        log(f"  Already exists as #{existing_issue['number']}, skipping")
+        return True
     
     title = frontmatter.get("title", "")
-    labels = frontmatter.get("labels", [])
+    labels = get_task_labels(frontmatter)
     parent = frontmatter.get("parent", "")
     project_attr = frontmatter.get("project", "")
     
-    # Ensure labels is a list
-    if isinstance(labels, str):
-        labels = [labels] if labels else []
-    
     if not title:
-        print(f"  Warning: No title in frontmatter, using filename", file=sys.stderr)
+        log(f"  Warning: No title in frontmatter, using filename", error=True)
         title = task_file.stem
     
     # Create temporary file with body content (without frontmatter)
@@ -478,30 +1036,37 @@ def process_task_file(task_file: Path, repo_project_id: str | None = None, skip_
         issue_url = create_github_issue(title, labels, tmp_path)
         
         if not issue_url:
-            print(f"  Failed to create issue for {task_file}", file=sys.stderr)
+            log(f"  Failed to create issue for {task_file}", error=True)
             return False
         
-        print(f"  Created issue: {issue_url}")
+        log(f"  Created issue: {issue_url}")
         
         issue_number = extract_issue_number(issue_url)
         
+        task_id = get_task_id(task_file, frontmatter)
+        if created_tasks is not None and task_id and issue_number:
+            created_tasks[task_id] = (issue_number, body)
+        
         # Add to project unless skipped
         if not skip_project and issue_number:
             project_id = resolve_project_id(project_attr if project_attr else None, repo_project_id)
             if project_id:
                 issue_id = get_issue_id(issue_number)
                 if issue_id:
-                    if add_issue_to_project(project_id, issue_id):
-                        print(f"  Added to project")
+                    item_id = add_issue_to_project(project_id, issue_id)
+                    if item_id:
+                        log(f"  Added to project")
+                        if field_map and field_updates is not None:
+                            field_updates.extend(collect_field_updates(project_id, item_id, frontmatter, field_map))
                     else:
-                        print(f"  Warning: Failed to add issue to project", file=sys.stderr)
+                        log(f"  Warning: Failed to add issue to project", error=True)
         
         # If there's a parent, assign it
         if parent and issue_number:
             if assign_parent_issue(issue_number, parent):
-                print(f"  Linked as sub-issue of: {parent}")
+                log(f"  Linked as sub-issue of: {parent}")
             else:
-                print(f"  Warning: Failed to create sub-issue relationship", file=sys.stderr)
+                log(f"  Warning: Failed to create sub-issue relationship", error=True)
         
         return True
         
@@ -510,6 +1075,55 @@ def process_task_file(task_file: Path, repo_project_id: str | None = None, skip_
         os.unlink(tmp_path)
 
 
+def process_epic_folder(
+    task_files: list[Path],
+    tasks: dict[Path, tuple[dict, str]],
+    repo_project_id: str | None = None,
+    skip_project: bool = False,
+    buffered: bool = False,
+    field_map: dict[str, str] | None = None,
+    created_tasks: dict[str, tuple[str, str]] | None = None,
+    existing_issues: dict[Path, dict] | None = None,
+) -> tuple[int, list[tuple[str, bool]]]:
+    """Create issues for one epic's task files, in sequence order.
+    
+    Args:
+        task_files: The epic's TASK files, sorted
+        tasks: Parsed (frontmatter, body) for every task file in the run
+        repo_project_id: Fallback project node ID from repository
+        skip_project: If True, skip adding to any project
+        buffered: If True, collect output instead of printing it (for workers)
+        field_map: Frontmatter key -> project field name mapping
+        created_tasks: Collects task ID -> (issue number, body) of created issues
+        existing_issues: Task file -> issue already created for it; those are skipped
+    
+    Returns:
+        Tuple of (success count, buffered (message, is_error) output lines)
+    """
+    output: list[tuple[str, bool]] = []
+    if buffered:
+        _thread_output.buffer = output
+    
+    try:
+        success_count = 0
+        field_updates: list[tuple[str, str, str, str]] = []
+        for task_file in task_files:
+            if process_task_file(
+                task_file, repo_project_id, skip_project,
+                parsed=tasks[task_file], field_map=field_map, field_updates=field_updates,
+                created_tasks=created_tasks, existing_issue=(existing_issues or {}).get(task_file)
+            ):
+                success_count += 1
+        
+        # Populate project fields for the whole epic in one batched mutation
+        if field_updates:
+            updated = update_project_fields(field_updates)
+            log(f"Set {updated}/{len(field_updates)} project field value(s)")
+        return success_count, output
+    finally:
+        _thread_output.buffer = None
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Create GitHub issues from TASK-???.md files"
@@ -528,6 +1142,37 @@ def main():
         action="store_true",
         help="Skip adding issues to any project"
     )
+    parser.add_argument(
+        "--create-missing-labels",
+        action="store_true",
+        help="Create labels missing from the repository before creating issues (default: fail fast)"
+    )
+    parser.add_argument(
+        "--skip-label-check",
+        action="store_true",
+        help="Skip the label preflight check"
+    )
+    parser.add_argument(
+        "--recursive",
+        action="store_true",
+        help="Treat target_folder as a root and process every epic tasks folder beneath it"
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=4,
+        help="Number of epics to process concurrently in --recursive mode (default: 4)"
+    )
+    parser.add_argument(
+        "--plan",
+        action="store_true",
+        help="Print a JSON create/update/skip/orphan plan against existing GitHub issues, without making changes"
+    )
+    parser.add_argument(
+        "--skip-dependencies",
+        action="store_true",
+        help="Don't rewrite TASK references or create blocked-by relationships after creating issues"
+    )
     
     args = parser.parse_args()
     
@@ -537,13 +1182,45 @@ def main():
         print(f"Error: {target_folder} is not a directory", file=sys.stderr)
         sys.exit(1)
     
-    task_files = find_task_files(target_folder)
+    if args.recursive:
+        epic_folders = find_epic_task_folders(target_folder)
+    else:
+        folder_files = find_task_files(target_folder)
+        epic_folders = {Path(target_folder): folder_files} if folder_files else {}
+    
+    task_files = [f for files in epic_folders.values() for f in files]
     
     if not task_files:
-        print(f"No TASK-???.md files found in {target_folder}")
+        if args.plan:
+            print(json.dumps({"status": "success", "summary": {}, "plan": []}, indent=2))
+        else:
+            print(f"No TASK-???.md files found in {target_folder}")
+        sys.exit(0)
+    
+    # Parse every task file once; all later steps reuse the parsed frontmatter
+    tasks = load_task_files(task_files)
+    
+    if args.plan:
+        # Only the JSON plan goes to stdout so pipelines can consume it directly
+        plan = build_sync_plan(tasks, target_folder)
+        if plan is None:
+            print("Error: Could not fetch existing issues from GitHub", file=sys.stderr)
+            sys.exit(1)
+        print(json.dumps(plan, indent=2))
         sys.exit(0)
     
-    print(f"Found {len(task_files)} task file(s)")
+    if args.recursive:
+        print(f"Found {len(task_files)} task file(s) in {len(epic_folders)} epic folder(s)")
+    else:
+        print(f"Found {len(task_files)} task file(s)")
+    
+    project_root = find_project_root(Path(target_folder))
+    
+    # Verify labels up front so a missing label can't fail the run halfway through
+    if not args.dry_run and not args.skip_label_check:
+        if not preflight_labels(tasks, project_root, create_missing=args.create_missing_labels):
+            print("Label preflight failed, no issues were created", file=sys.stderr)
+            sys.exit(1)
     
     # Get fallback repo project ID unless disabled
     repo_project_id = None
@@ -555,20 +1232,66 @@ def main():
     
     if args.dry_run:
         print("\nDry run - would process:")
-        for f in task_files:
-            content = f.read_text()
-            fm, _ = parse_frontmatter(content)
-            labels = fm.get("labels", [])
-            if isinstance(labels, str):
-                labels = [labels] if labels else []
+        for f, (fm, _) in tasks.items():
+            labels = get_task_labels(fm)
             project = fm.get("project", "(auto)")
-            print(f"  {f.name}: title='{fm.get('title', 'N/A')}', labels={labels}, parent='{fm.get('parent', 'N/A')}', project='{project}'")
+            name = os.path.relpath(f, target_folder) if args.recursive else f.name
+            if fm.get("link"):
+                print(f"  {name}: already published as {fm['link']} (skip)")
+                continue
+            print(f"  {name}: title='{fm.get('title', 'N/A')}', labels={labels}, parent='{fm.get('parent', 'N/A')}', project='{project}'")
         sys.exit(0)
     
+    # Tasks whose issue exists but whose file has no link (e.g. published by an
+    # earlier run) are matched by title, as --plan does, so they aren't duplicated
+    fetched = fetch_existing_issues({f: parsed for f, parsed in tasks.items() if not parsed[0].get("link")})
+    if fetched is None:
+        print("Error: Could not fetch existing issues from GitHub, no issues were created", file=sys.stderr)
+        sys.exit(1)
+    existing_issues = fetched[0]
+    
+    field_map = load_project_field_map(project_root)
+    created_tasks: dict[str, tuple[str, str]] = {}
+    
     success_count = 0
-    for task_file in task_files:
-        if process_task_file(task_file, repo_project_id, skip_project=args.no_project):
-            success_count += 1
+    if len(epic_folders) == 1:
+        success_count, _ = process_epic_folder(
+            task_files, tasks, repo_project_id, skip_project=args.no_project,
+            field_map=field_map, created_tasks=created_tasks, existing_issues=existing_issues
+        )
+    else:
+        # Epics are independent, so process them concurrently. Tasks within an
+        # epic stay sequential so issue numbers follow the task order.
+        folder_results: dict[Path, tuple[int, int]] = {}
+        with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as executor:
+            futures = {
+                executor.submit(
+                    process_epic_folder, files, tasks, repo_project_id, args.no_project, True,
+                    field_map, created_tasks, existing_issues
+                ): folder
+                for folder, files in epic_folders.items()
+            }
+            for done, future in enumerate(as_completed(futures), start=1):
+                folder = futures[future]
+                folder_success, output = future.result()
+                print(f"\n[{done}/{len(epic_folders)}] {os.path.relpath(folder, target_folder)}")
+                for message, is_error in output:
+                    print(message, file=sys.stderr if is_error else sys.stdout)
+                folder_results[folder] = (folder_success, len(epic_folders[folder]))
+                success_count += folder_success
+        
+        print("\nSummary:")
+        for folder in epic_folders:
+            folder_success, folder_total = folder_results[folder]
+            print(f"  {os.path.relpath(folder, target_folder)}: {folder_success}/{folder_total}")
+    
+    # With every issue number known, publish TASK references as real dependencies
+    if created_tasks and not args.skip_dependencies:
+        task_issues = known_task_issues(tasks, existing_issues)
+        task_issues.update({task_id: number for task_id, (number, _) in created_tasks.items()})
+        print("\nPublishing task dependencies...")
+        bodies_updated, dependencies_added = publish_task_dependencies(created_tasks, task_issues)
+        print(f"Rewrote task references in {bodies_updated} issue(s), added {dependencies_added} blocked-by relationship(s)")
     
     print(f"\nProcessed {success_count}/{len(task_files)} task files successfully")
     
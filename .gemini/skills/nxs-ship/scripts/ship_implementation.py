@@ -24,14 +24,26 @@ Output:
     JSON object with commit info, closure status, and checkpoint requirements
 """
 
-import argparse
-import json
 import os
-import re
-import subprocess
 import sys
-from pathlib import Path
-from typing import Dict, Any, List, Optional, Tuple
+
+sys.path.insert(0, os.path.normpath(os.path.join(os.path.dirname(os.path.realpath(__file__)), "..", "..", "..", "lib")))
+
+from nxs_client import forward_to_daemon  # noqa: E402
+
+if __name__ == "__main__":
+    # Hand the call to a running nxs daemon before the heavier imports below
+    forward_to_daemon("ship_implementation")
+
+import argparse  # noqa: E402
+import json  # noqa: E402
+import re  # noqa: E402
+import subprocess  # noqa: E402
+from pathlib import Path  # noqa: E402
+from typing import Dict, Any, List, Optional, Tuple  # noqa: E402
+
+from port_registry import release_ports  # noqa: E402
+from repo_meta import get_repo_meta, git_dirs  # noqa: E402
 
 
 def run_command(
@@ -164,17 +176,13 @@ def post_github_comment(
         ])
 
         # Get comment URL (gh doesn't return it, so construct it)
-        # This is a best-effort URL construction
-        repo_result = run_command(
-            ["gh", "repo", "view", "--json", "url", "--jq", ".url"],
-            check=False
-        )
-
-        if repo_result.returncode == 0:
-            repo_url = repo_result.stdout.strip()
-            return f"{repo_url}/issues/{issue_number}#issuecomment"
+        # This is a best-effort URL construction from the cached repo metadata
+        try:
+            repo_url = get_repo_meta()["url"]
+        except RuntimeError:
+            return ""
 
-        return ""
+        return f"{repo_url}/issues/{issue_number}#issuecomment"
 
     except RuntimeError as e:
         print(f"Warning: Failed to post GitHub comment: {e}", file=sys.stderr)
@@ -254,7 +262,7 @@ def close_github_issue(issue_number: str) -> bool:
 
 
 def cleanup_worktree(worktree_path: str) -> bool:
-    """Remove a git worktree.
+    """Remove a git worktree and release its port block.
 
     Args:
         worktree_path: Path to worktree to remove
@@ -263,11 +271,16 @@ def cleanup_worktree(worktree_path: str) -> bool:
         True if worktree was removed successfully
     """
     try:
+        main_root = git_dirs(Path(worktree_path))[1]
         run_command(["git", "worktree", "remove", worktree_path])
-        return True
     except RuntimeError as e:
         print(f"Warning: Failed to remove worktree: {e}", file=sys.stderr)
         return False
+    try:
+        release_ports(Path(worktree_path), main_root)
+    except (OSError, RuntimeError) as e:
+        print(f"Warning: Failed to release ports: {e}", file=sys.stderr)
+    return True
 
 
 def ship_implementation(
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the fast-status settings applied to new worktrees.
+
+Builds a synthetic repository with many tracked files and a linked
+worktree configured by configure_fast_status(), each with a large
+untracked node_modules-style tree. `git status --porcelain` is timed in
+both, interleaved so machine noise affects them equally. Without the builtin fsmonitor
+(unsupported on Linux) the lstat pass over tracked files remains, so the
+gain there comes from the untracked cache and the smaller index.
+
+Usage:
+    python bench_git_status.py [--tracked 20000] [--untracked 50000] [--repeat 10] [--keep]
+
+Output:
+    Best-of-N status timings, one line per configuration.
+"""
+
+import argparse
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from setup_workspace import configure_fast_status  # noqa: E402
+
+
+def git(args: list[str], cwd: Path) -> None:
+    subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True)
+
+
+def write_tree(root: Path, count: int, per_dir: int = 50) -> None:
+    """Write count small files spread over directories of per_dir files."""
+    for i in range(count):
+        directory = root / f"d{i // (per_dir * per_dir)}" / f"d{(i // per_dir) % per_dir}"
+        if i % per_dir == 0:
+            directory.mkdir(parents=True, exist_ok=True)
+        (directory / f"f{i}.ts").write_text(f"export const v{i} = {i};\n")
+
+
+def make_repo(base: Path, tracked: int, untracked: int) -> tuple[Path, Path]:
+    """Create a committed repository and a fast-status worktree of it.
+
+    Both get an untracked (not ignored) dependency tree.
+
+    Returns:
+        (main checkout with default settings, configured worktree)
+    """
+    repo = base / "repo"
+    repo.mkdir()
+    git(["init", "-q"], repo)
+    write_tree(repo / "src", tracked)
+    git(["add", "-A"], repo)
+    git(["-c", "user.name=bench", "-c", "user.email=bench@example.com", "commit", "-qm", "init"], repo)
+
+    worktree = base / "worktree"
+    git(["worktree", "add", "-q", "--detach", str(worktree)], repo)
+    for checkout in (repo, worktree):
+        write_tree(checkout / "vendor_modules", untracked)
+
+    # Entries written in the same second as the index are racy and get rechecked; let them settle
+    time.sleep(1)
+    configure_fast_status(str(worktree))
+    for checkout in (repo, worktree):
+        git(["status", "--porcelain"], checkout)
+    return repo, worktree
+
+
+def interleaved_best(repeat: int, checkouts: list[Path]) -> list[float]:
+    """Return the best git status time of each checkout, alternating between them."""
+    timings: list[list[float]] = [[] for _ in checkouts]
+    for _ in range(repeat):
+        for checkout, runs in zip(checkouts, timings):
+            start = time.perf_counter()
+            git(["status", "--porcelain"], checkout)
+            runs.append(time.perf_counter() - start)
+    return [min(runs) for runs in timings]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark git status with and without the fast-status settings")
+    parser.add_argument("--tracked", type=int, default=20000, help="Tracked files (default: 20000)")
+    parser.add_argument("--untracked", type=int, default=50000, help="Untracked files (default: 50000)")
+    parser.add_argument("--repeat", type=int, default=10, help="Runs per configuration, best is reported (default: 10)")
+    parser.add_argument("--keep", action="store_true", help="Keep the synthetic repository and print its path")
+    args = parser.parse_args()
+
+    base = Path(tempfile.mkdtemp(prefix="nxs-bench-status-"))
+    try:
+        print(f"Building repository: {args.tracked} tracked, {args.untracked} untracked files...")
+        repo, worktree = make_repo(base, args.tracked, args.untracked)
+        default_time, fast_time = interleaved_best(args.repeat, [repo, worktree])
+
+        print(f"  default settings:     {default_time * 1000:8.2f} ms")
+        print(f"  fast-status settings: {fast_time * 1000:8.2f} ms ({default_time / fast_time:.1f}x)")
+    finally:
+        if args.keep:
+            print(f"Repository kept at {base}")
+        else:
+            shutil.rmtree(base, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -14,20 +14,50 @@ Usage:
         --issue-title <title> \\
         --issue-body <body> \\
         --yolo-mode <true|false> \\
-        [--workspace-config <path>:<branch>]
+        [--workspace-config <path>:<branch>] \\
+        [--sparse]
 
 Output:
     JSON object with workspace metadata and checkpoint requirements
 """
 
-import argparse
-import json
 import os
-import re
-import subprocess
 import sys
-from pathlib import Path
-from typing import Dict, Any, Optional, Tuple
+
+sys.path.insert(0, os.path.normpath(os.path.join(os.path.dirname(os.path.realpath(__file__)), "..", "..", "..", "lib")))
+
+from nxs_client import forward_to_daemon  # noqa: E402
+
+if __name__ == "__main__":
+    # Hand the call to a running nxs daemon before the heavier imports below
+    forward_to_daemon("setup_workspace")
+
+import argparse  # noqa: E402
+import json  # noqa: E402
+import re  # noqa: E402
+import subprocess  # noqa: E402
+from dataclasses import dataclass, field  # noqa: E402
+from pathlib import Path  # noqa: E402
+from typing import Dict, Any, List, Optional, Set, Tuple  # noqa: E402
+
+from port_registry import allocate_ports  # noqa: E402
+from repo_meta import get_repo_root  # noqa: E402
+
+# Directories checked out in every sparse worktree besides the affected projects
+# (cone mode always includes the files at the repository root)
+SPARSE_ALWAYS = [".gemini"]
+
+# Per-worktree settings that keep git status/diff fast on large trees
+FAST_STATUS_CONFIG = {
+    "core.untrackedCache": "true",
+    "feature.manyFiles": "true",
+    "index.version": "4",
+}
+
+# "### Files" section of a task body, up to the next heading
+FILES_SECTION_PATTERN = re.compile(r"^#{2,}\s+Files\b[^\n]*\n(?P<body>.*?)(?=^#{1,3}\s|\Z)", re.MULTILINE | re.DOTALL)
+# First `path` of a bullet line
+FILE_ITEM_PATTERN = re.compile(r"^\s*[-*]\s+`([^`]+)`", re.MULTILINE)
 
 
 def run_command(cmd: list[str], cwd: Optional[str] = None, check: bool = True) -> subprocess.CompletedProcess:
@@ -55,14 +85,91 @@ def run_command(cmd: list[str], cwd: Optional[str] = None, check: bool = True) -
     return result
 
 
-def get_current_branch() -> str:
-    """Get the current git branch name.
+@dataclass
+class Worktree:
+    """One entry of `git worktree list --porcelain`."""
+    path: Path
+    head: str = ""
+    branch: str = ""  # Short branch name, empty if detached
 
-    Returns:
-        Current branch name or empty string if detached HEAD
+
+@dataclass
+class GitSnapshot:
+    """In-memory view of the repository state that workspace setup decides on.
+
+    Built once per run by probe_git_state(); every branch, conflict and
+    worktree check answers from it instead of spawning git again.
     """
-    result = run_command(["git", "branch", "--show-current"])
-    return result.stdout.strip()
+    root: Path
+    current_branch: str
+    local_branches: Set[str] = field(default_factory=set)
+    remote_branches: Dict[str, str] = field(default_factory=dict)  # Short name -> "<remote>/<name>"
+    worktrees: List[Worktree] = field(default_factory=list)
+
+    def branch_exists(self, branch_name: str) -> bool:
+        """Check if a local branch exists."""
+        return branch_name in self.local_branches
+
+    def remote_branch(self, branch_name: str) -> Optional[str]:
+        """Return the remote-tracking ref ("origin/<name>") for a branch, if any."""
+        return self.remote_branches.get(branch_name)
+
+    def worktree_at(self, path: str) -> Optional[Worktree]:
+        """Return the worktree registered at path, if any."""
+        abs_path = Path(path).resolve()
+        for worktree in self.worktrees:
+            if worktree.path == abs_path:
+                return worktree
+        return None
+
+
+def parse_worktree_list(porcelain: str) -> List[Worktree]:
+    """Parse `git worktree list --porcelain` output.
+
+    Each attribute line is "<key> <value>", so paths containing spaces are
+    kept whole by splitting on the first space only.
+    """
+    worktrees: List[Worktree] = []
+    for line in porcelain.splitlines():
+        key, _, value = line.partition(" ")
+        if key == "worktree":
+            worktrees.append(Worktree(path=Path(value).resolve()))
+        elif worktrees and key == "HEAD":
+            worktrees[-1].head = value
+        elif worktrees and key == "branch":
+            worktrees[-1].branch = value.removeprefix("refs/heads/")
+    return worktrees
+
+
+def probe_git_state() -> GitSnapshot:
+    """Build a GitSnapshot of the current repository with three git calls.
+
+    The worktree root comes from the shared repo_meta lookup, refs from a
+    single for-each-ref and the current branch from the worktree list entry
+    for this checkout (which also covers unborn branches).
+    """
+    root = get_repo_root()
+
+    refs = run_command(["git", "for-each-ref", "--format=%(refname)", "refs/heads", "refs/remotes"]).stdout
+    local_branches = set()
+    remote_branches: Dict[str, str] = {}
+    for ref in refs.splitlines():
+        if ref.startswith("refs/heads/"):
+            local_branches.add(ref.removeprefix("refs/heads/"))
+        elif ref.startswith("refs/remotes/") and not ref.endswith("/HEAD"):
+            remote_ref = ref.removeprefix("refs/remotes/")
+            remote_branches.setdefault(remote_ref.partition("/")[2], remote_ref)
+
+    worktrees = parse_worktree_list(run_command(["git", "worktree", "list", "--porcelain"]).stdout)
+    current = next((w for w in worktrees if w.path == root.resolve()), None)
+
+    return GitSnapshot(
+        root=root,
+        current_branch=current.branch if current else "",
+        local_branches=local_branches,
+        remote_branches=remote_branches,
+        worktrees=worktrees,
+    )
 
 
 def is_main_branch(branch: str) -> bool:
@@ -77,22 +184,6 @@ def is_main_branch(branch: str) -> bool:
     return branch in ["main", "master"]
 
 
-def branch_exists(branch_name: str) -> bool:
-    """Check if a git branch exists.
-
-    Args:
-        branch_name: Name of branch to check
-
-    Returns:
-        True if branch exists
-    """
-    result = run_command(
-        ["git", "show-ref", "--verify", "--quiet", f"refs/heads/{branch_name}"],
-        check=False
-    )
-    return result.returncode == 0
-
-
 def parse_workspace_config(issue_body: str) -> Optional[Tuple[str, str]]:
     """Extract workspace configuration from issue body.
 
@@ -119,19 +210,98 @@ def parse_workspace_config(issue_body: str) -> Optional[Tuple[str, str]]:
     return None
 
 
-def generate_workspace_suggestion(issue_number: str, issue_title: str) -> Tuple[str, str]:
+def parse_task_files(issue_body: str) -> List[str]:
+    """Extract the file paths listed in the issue's "### Files" section.
+
+    Args:
+        issue_body: Full issue body text
+
+    Returns:
+        Repository-relative file paths (empty if there is no Files section)
+    """
+    match = FILES_SECTION_PATTERN.search(issue_body)
+    if not match:
+        return []
+    return [path.strip().removeprefix("./") for path in FILE_ITEM_PATTERN.findall(match.group("body"))]
+
+
+def find_workspace_projects(snapshot: GitSnapshot) -> Dict[str, Dict[str, Any]]:
+    """Find the Nx/pnpm workspace projects from tracked project.json and package.json files.
+
+    Uses the git index, so no directory (node_modules included) is walked.
+
+    Returns:
+        Dict of project directory -> {"name": package name, "deps": workspace dependency names}
+    """
+    result = run_command(
+        ["git", "ls-files", "-z", "--", ":(glob)**/project.json", ":(glob)**/package.json"],
+        cwd=str(snapshot.root)
+    )
+    projects: Dict[str, Dict[str, Any]] = {}
+    for path in filter(None, result.stdout.split("\0")):
+        directory = str(Path(path).parent)
+        if directory == ".":
+            continue
+        project = projects.setdefault(directory, {"name": None, "deps": set()})
+        if path.endswith("package.json"):
+            try:
+                package = json.loads((snapshot.root / path).read_text())
+            except (OSError, ValueError):
+                continue
+            project["name"] = package.get("name")
+            for section in ("dependencies", "devDependencies", "peerDependencies"):
+                for name, version in (package.get(section) or {}).items():
+                    if str(version).startswith("workspace:"):
+                        project["deps"].add(name)
+    return projects
+
+
+def compute_sparse_paths(snapshot: GitSnapshot, files: List[str]) -> List[str]:
+    """Map task files to the directories a cone-mode sparse checkout needs.
+
+    Each file selects its innermost workspace project; workspace
+    dependencies of selected projects are added transitively. Files outside
+    any project select their top-level directory.
+
+    Returns:
+        Sorted directories, or an empty list if files is empty
+    """
+    if not files:
+        return []
+    projects = find_workspace_projects(snapshot)
+    by_name = {project["name"]: directory for directory, project in projects.items() if project["name"]}
+
+    selected: Set[str] = set()
+    for file_path in files:
+        owners = [d for d in projects if file_path == d or file_path.startswith(d + "/")]
+        if owners:
+            selected.add(max(owners, key=len))
+        elif "/" in file_path:
+            selected.add(file_path.split("/", 1)[0])
+
+    pending = list(selected)
+    while pending:
+        for dep in projects.get(pending.pop(), {}).get("deps", ()):
+            directory = by_name.get(dep)
+            if directory and directory not in selected:
+                selected.add(directory)
+                pending.append(directory)
+
+    return sorted(selected | set(SPARSE_ALWAYS)) if selected else []
+
+
+def generate_workspace_suggestion(snapshot: GitSnapshot, issue_number: str, issue_title: str) -> Tuple[str, str]:
     """Generate suggested worktree path and branch name from issue.
 
     Args:
+        snapshot: Repository state
         issue_number: GitHub issue number
         issue_title: Issue title
 
     Returns:
         Tuple of (worktree_path, branch_name)
     """
-    # Get repository name
-    repo_root = run_command(["git", "rev-parse", "--show-toplevel"]).stdout.strip()
-    repo_name = os.path.basename(repo_root)
+    repo_name = snapshot.root.name
 
     # Create slug from issue title (lowercase, alphanumeric + hyphens, max 50 chars)
     slug = issue_title.lower()
@@ -146,24 +316,80 @@ def generate_workspace_suggestion(issue_number: str, issue_title: str) -> Tuple[
     return (worktree_path, branch_name)
 
 
-def create_worktree(path: str, branch: str, exists_ok: bool = False) -> bool:
+def apply_sparse_checkout(path: str, sparse_paths: List[str]) -> None:
+    """Restrict a --no-checkout worktree to sparse_paths, then check it out.
+
+    The sparse-checkout settings are per worktree, so the main checkout
+    stays complete. If they can't be applied, the full tree is checked out.
+    """
+    try:
+        run_command(["git", "sparse-checkout", "set", "--cone", *sparse_paths], cwd=path)
+    except RuntimeError as e:
+        print(f"Warning: sparse checkout failed, checking out the full tree: {e}", file=sys.stderr)
+        run_command(["git", "sparse-checkout", "disable"], cwd=path, check=False)
+    run_command(["git", "checkout"], cwd=path)
+
+
+def fsmonitor_supported() -> bool:
+    """Check whether this git build ships the builtin fsmonitor daemon (macOS/Windows)."""
+    result = run_command(["git", "version", "--build-options"], check=False)
+    return "fsmonitor--daemon" in result.stdout
+
+
+def configure_fast_status(path: str) -> None:
+    """Opt a new worktree into git's large-repository performance settings.
+
+    Settings are written with --worktree (enabling extensions.worktreeConfig,
+    as sparse-checkout does), so the main checkout is left unchanged. The
+    index is then rewritten as version 4 and warmed with one status run,
+    which also fills the untracked cache. Failures are only warnings.
+    """
+    settings = dict(FAST_STATUS_CONFIG)
+    if fsmonitor_supported():
+        settings["core.fsmonitor"] = "true"
+    try:
+        run_command(["git", "config", "extensions.worktreeConfig", "true"], cwd=path)
+        for key, value in settings.items():
+            run_command(["git", "config", "--worktree", key, value], cwd=path)
+        run_command(["git", "update-index", "--index-version", "4"], cwd=path)
+        run_command(["git", "status", "--porcelain"], cwd=path)
+    except RuntimeError as e:
+        print(f"Warning: could not apply fast-status settings: {e}", file=sys.stderr)
+
+
+def create_worktree(
+    snapshot: GitSnapshot,
+    path: str,
+    branch: str,
+    exists_ok: bool = False,
+    sparse_paths: Optional[List[str]] = None
+) -> bool:
     """Create a git worktree.
 
     Args:
+        snapshot: Repository state
         path: Path for new worktree
         branch: Branch name to create/checkout
         exists_ok: If True, checkout existing branch instead of creating new
+        sparse_paths: If given, create a sparse (cone mode) worktree with only these directories
 
     Returns:
         True if worktree was created successfully
     """
+    add = ["git", "worktree", "add", *(["--no-checkout"] if sparse_paths else [])]
     try:
-        if exists_ok and branch_exists(branch):
+        if exists_ok and snapshot.branch_exists(branch):
             # Checkout existing branch in new worktree
-            run_command(["git", "worktree", "add", path, branch])
+            run_command([*add, path, branch])
+        elif exists_ok and snapshot.remote_branch(branch):
+            # Branch only exists on the remote: track it instead of branching from HEAD
+            run_command([*add, "--track", "-b", branch, path, snapshot.remote_branch(branch)])
         else:
             # Create new branch in worktree
-            run_command(["git", "worktree", "add", path, "-b", branch])
+            run_command([*add, path, "-b", branch])
+        if sparse_paths:
+            apply_sparse_checkout(path, sparse_paths)
+        configure_fast_status(path)
         return True
     except RuntimeError as e:
         print(f"Error creating worktree: {e}", file=sys.stderr)
@@ -187,19 +413,17 @@ def create_branch_in_place(branch: str) -> bool:
         return False
 
 
-def worktree_exists(path: str) -> bool:
-    """Check if a worktree already exists at the given path.
-
-    Args:
-        path: Path to check
+def reserve_ports(path: str) -> Optional[Dict[str, Any]]:
+    """Allocate the worktree's port block; a failure only costs the isolation.
 
     Returns:
-        True if worktree exists
+        The block (see port_registry.py), or None if none could be allocated
     """
-    result = run_command(["git", "worktree", "list"], check=True)
-    worktree_paths = [line.split()[0] for line in result.stdout.strip().split('\n')]
-    abs_path = str(Path(path).resolve())
-    return abs_path in worktree_paths
+    try:
+        return allocate_ports(Path(path))
+    except (OSError, RuntimeError) as e:
+        print(f"Warning: Failed to allocate ports: {e}", file=sys.stderr)
+        return None
 
 
 def setup_workspace(
@@ -207,7 +431,8 @@ def setup_workspace(
     issue_title: str,
     issue_body: str,
     yolo_mode: bool,
-    workspace_config: Optional[str] = None
+    workspace_config: Optional[str] = None,
+    sparse: bool = False
 ) -> Dict[str, Any]:
     """Main workspace setup logic.
 
@@ -217,12 +442,14 @@ def setup_workspace(
         issue_body: Full issue body
         yolo_mode: If True, auto-approve workspace creation
         workspace_config: Optional explicit workspace config "path:branch"
+        sparse: If True, check out only the projects the issue's Files section touches
 
     Returns:
         Dictionary with workspace metadata and checkpoint info
     """
-    # Step 1: Check current branch
-    current_branch = get_current_branch()
+    # Step 1: Check current branch (all git state is probed once, up front)
+    snapshot = probe_git_state()
+    current_branch = snapshot.current_branch
 
     # If already on a feature branch, use in-place mode
     if current_branch and not is_main_branch(current_branch):
@@ -251,28 +478,34 @@ def setup_workspace(
         if config:
             worktree_path, branch_name = config
 
+    # Sparse worktrees follow the task's file list; without one, check out everything
+    sparse_paths = compute_sparse_paths(snapshot, parse_task_files(issue_body)) if sparse else []
+
     # If config found, create worktree without prompting
     if worktree_path and branch_name:
         # Check if worktree already exists
-        if worktree_exists(worktree_path):
+        if snapshot.worktree_at(worktree_path):
             return {
                 "workspace_path": str(Path(worktree_path).resolve()),
                 "workspace_branch": branch_name,
                 "workspace_mode": "worktree",
                 "action_taken": "reused",
+                "ports": reserve_ports(worktree_path),
                 "env_sync_performed": False,
                 "checkpoint_required": False,
                 "checkpoint_data": None
             }
 
         # Create worktree (handling existing branches)
-        success = create_worktree(worktree_path, branch_name, exists_ok=True)
+        success = create_worktree(snapshot, worktree_path, branch_name, exists_ok=True, sparse_paths=sparse_paths)
         if success:
             return {
                 "workspace_path": str(Path(worktree_path).resolve()),
                 "workspace_branch": branch_name,
                 "workspace_mode": "worktree",
                 "action_taken": "created",
+                "sparse_paths": sparse_paths or None,
+                "ports": reserve_ports(worktree_path),
                 "env_sync_performed": False,
                 "checkpoint_required": True,
                 "checkpoint_data": {
@@ -296,11 +529,13 @@ def setup_workspace(
             }
 
     # Step 3: Generate suggestions and handle YOLO vs normal mode
-    suggested_path, suggested_branch = generate_workspace_suggestion(issue_number, issue_title)
+    suggested_path, suggested_branch = generate_workspace_suggestion(snapshot, issue_number, issue_title)
 
-    # Check for branch conflict
-    if branch_exists(suggested_branch):
+    # Check for branch conflict (locally or on a remote)
+    remote_branch = snapshot.remote_branch(suggested_branch)
+    if snapshot.branch_exists(suggested_branch) or remote_branch:
         # Branch conflict - ALWAYS prompt user (even in YOLO mode)
+        location = "" if snapshot.branch_exists(suggested_branch) else f" on remote ({remote_branch})"
         return {
             "workspace_path": None,
             "workspace_branch": None,
@@ -310,7 +545,7 @@ def setup_workspace(
             "checkpoint_required": True,
             "checkpoint_data": {
                 "type": "branch_conflict",
-                "message": f"Branch '{suggested_branch}' already exists",
+                "message": f"Branch '{suggested_branch}' already exists{location}",
                 "suggested_branch": suggested_branch,
                 "options": [
                     {"label": "Use existing branch", "value": "use_existing"},
@@ -322,13 +557,15 @@ def setup_workspace(
 
     # YOLO mode - auto-create worktree
     if yolo_mode:
-        success = create_worktree(suggested_path, suggested_branch)
+        success = create_worktree(snapshot, suggested_path, suggested_branch, sparse_paths=sparse_paths)
         if success:
             return {
                 "workspace_path": str(Path(suggested_path).resolve()),
                 "workspace_branch": suggested_branch,
                 "workspace_mode": "worktree",
                 "action_taken": "created",
+                "sparse_paths": sparse_paths or None,
+                "ports": reserve_ports(suggested_path),
                 "env_sync_performed": False,
                 "checkpoint_required": True,
                 "checkpoint_data": {
@@ -418,6 +655,11 @@ def main():
         required=False,
         help="Optional explicit workspace config 'path:branch'"
     )
+    parser.add_argument(
+        "--sparse",
+        action="store_true",
+        help="Create worktrees as sparse checkouts of the projects listed in the issue's Files section"
+    )
 
     args = parser.parse_args()
 
@@ -430,7 +672,8 @@ def main():
         issue_title=args.issue_title,
         issue_body=args.issue_body,
         yolo_mode=yolo_mode,
-        workspace_config=args.workspace_config
+        workspace_config=args.workspace_config,
+        sparse=args.sparse
     )
 
     # Output JSON result
@@ -2,8 +2,11 @@ import { defineConfig, devices } from '@playwright/test';
 import { nxE2EPreset } from '@nx/playwright/preset';
 import { workspaceRoot } from '@nx/devkit';
 
+// Worktrees get their own preview port in .env (see .gemini/lib/port_registry.py)
+const previewURL = `http://localhost:${process.env['WEB_PREVIEW_PORT'] || 4200}`;
+
 // For CI, you may want to set BASE_URL to the deployed application.
-const baseURL = process.env['BASE_URL'] || 'http://localhost:4200';
+const baseURL = process.env['BASE_URL'] || previewURL;
 
 /**
  * Read environment variables from file.
@@ -25,7 +28,7 @@ export default defineConfig({
   /* Run your local dev server before starting the tests */
   webServer: {
     command: 'pnpm exec nx run web:preview',
-    url: 'http://localhost:4200',
+    url: previewURL,
     reuseExistingServer: true,
     cwd: workspaceRoot
   },
@@ -2,15 +2,19 @@
 import { defineConfig } from 'vite';
 import react from '@vitejs/plugin-react-swc';
 
+// Worktrees get their own ports in .env (see .gemini/lib/port_registry.py)
+const port = Number(process.env['WEB_PORT']) || 4200;
+const previewPort = Number(process.env['WEB_PREVIEW_PORT']) || 4200;
+
 export default defineConfig(() => ({
   root: import.meta.dirname,
   cacheDir: '../../node_modules/.vite/apps/web',
   server:{
-    port: 4200,
+    port,
     host: 'localhost',
   },
   preview:{
-    port: 4200,
+    port: previewPort,
     host: 'localhost',
   },
   plugins: [react()],